@@ -1,41 +1,95 @@
-from kagi_client.assistant import AssistantClient
-from kagi_client.auth import KagiAuth
-from kagi_client.client import KagiClient
-from kagi_client.errors import (
-    APIError,
-    AuthError,
-    KagiError,
-    StreamParseError,
-    TokenExpiredError,
-)
-from kagi_client.formatters import OutputFormat
-from kagi_client.models import (
-    AssistantMessage,
-    AssistantResult,
-    AssistantThread,
-    AuthResponse,
-    DetectedLanguage,
-    DomainInfo,
-    ProofreadAnalysis,
-    ProofreadResult,
-    ResponseMetadata,
-    SearchInfo,
-    SearchItem,
-    SearchResult,
-    SummaryResult,
-    SummaryUpdate,
-    TokenPayload,
-    ToneAnalysis,
-    WordStats,
-    WritingStatistics,
-)
-from kagi_client.proofread import ProofreadClient
-from kagi_client.search import SearchClient
-from kagi_client.summarizer import SummarizerClient
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kagi_client.assistant import AssistantClient
+    from kagi_client.auth import KagiAuth
+    from kagi_client.client import KagiClient
+    from kagi_client.errors import (
+        APIError,
+        AuthError,
+        KagiError,
+        StreamParseError,
+        TokenExpiredError,
+    )
+    from kagi_client.formatters import OutputFormat
+    from kagi_client.models import (
+        AssistantDelta,
+        AssistantMessage,
+        AssistantResult,
+        AssistantThread,
+        AuthResponse,
+        DetectedLanguage,
+        DomainInfo,
+        ProofreadAnalysis,
+        ProofreadResult,
+        ResponseMetadata,
+        SearchInfo,
+        SearchItem,
+        SearchResult,
+        SummaryResult,
+        SummaryUpdate,
+        TokenPayload,
+        ToneAnalysis,
+        WordStats,
+        WritingStatistics,
+    )
+    from kagi_client.proofread import ProofreadClient
+    from kagi_client.search import SearchClient
+    from kagi_client.summarizer import SummarizerClient
+
+# Public names are imported on first access so light entry points such as
+# ``kagi --version`` do not pay for httpx, typer and rich.
+_EXPORTS = {
+    "APIError": "kagi_client.errors",
+    "AssistantClient": "kagi_client.assistant",
+    "AssistantDelta": "kagi_client.models",
+    "AssistantMessage": "kagi_client.models",
+    "AssistantResult": "kagi_client.models",
+    "AssistantThread": "kagi_client.models",
+    "AuthError": "kagi_client.errors",
+    "AuthResponse": "kagi_client.models",
+    "DetectedLanguage": "kagi_client.models",
+    "DomainInfo": "kagi_client.models",
+    "KagiAuth": "kagi_client.auth",
+    "KagiClient": "kagi_client.client",
+    "KagiError": "kagi_client.errors",
+    "OutputFormat": "kagi_client.formatters",
+    "ProofreadAnalysis": "kagi_client.models",
+    "ProofreadClient": "kagi_client.proofread",
+    "ProofreadResult": "kagi_client.models",
+    "ResponseMetadata": "kagi_client.models",
+    "SearchClient": "kagi_client.search",
+    "SearchInfo": "kagi_client.models",
+    "SearchItem": "kagi_client.models",
+    "SearchResult": "kagi_client.models",
+    "StreamParseError": "kagi_client.errors",
+    "SummarizerClient": "kagi_client.summarizer",
+    "SummaryResult": "kagi_client.models",
+    "SummaryUpdate": "kagi_client.models",
+    "TokenExpiredError": "kagi_client.errors",
+    "TokenPayload": "kagi_client.models",
+    "ToneAnalysis": "kagi_client.models",
+    "WordStats": "kagi_client.models",
+    "WritingStatistics": "kagi_client.models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "APIError",
     "AssistantClient",
+    "AssistantDelta",
     "AssistantMessage",
     "AssistantResult",
     "AssistantThread",
@@ -0,0 +1,25 @@
+"""Console entry point for ``kagi``.
+
+``kagi --version`` is answered here, before typer, rich and httpx are
+imported, since scripts call it far more often than its output changes.
+"""
+
+from __future__ import annotations
+
+import sys
+
+
+def main() -> None:
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        from kagi_client._version import resolve_version
+
+        print(resolve_version())
+        return
+
+    from kagi_client.cli import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""JSON helpers, using orjson when the ``speedups`` extra is installed."""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    from orjson import OPT_INDENT_2, JSONDecodeError, loads
+    from orjson import dumps as _dumps
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON."""
+        return _dumps(obj)
+
+    def dumps_pretty(obj: Any) -> str:
+        """Serialize ``obj`` to JSON indented by two spaces."""
+        return _dumps(obj, option=OPT_INDENT_2).decode()
+
+except ImportError:
+    import json
+    from json import JSONDecodeError, loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON."""
+        # Same output as httpx's ``json=`` encoding.
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def dumps_pretty(obj: Any) -> str:
+        """Serialize ``obj`` to JSON indented by two spaces."""
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+__all__ = ["JSONDecodeError", "dumps", "dumps_pretty", "loads"]
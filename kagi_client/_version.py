@@ -0,0 +1,44 @@
+"""Version lookup shared by the CLI and its ``--version`` fast path."""
+
+from __future__ import annotations
+
+import functools
+import os
+import subprocess
+from importlib import metadata
+
+
+def _git_version() -> str | None:
+    git_commands = [
+        ["git", "describe", "--tags", "--exact-match"],
+        ["git", "describe", "--tags", "--always", "--dirty"],
+    ]
+    for command in git_commands:
+        try:
+            result = subprocess.run(
+                command,
+                check=True,
+                text=True,
+                capture_output=True,
+            )
+            version = result.stdout.strip()
+            if version:
+                return version
+        except (subprocess.SubprocessError, OSError):
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def resolve_version() -> str:
+    # Installed metadata is cheap; forking git is reserved for development
+    # checkouts (KAGI_DEV=1) where the tag is more precise.
+    if os.environ.get("KAGI_DEV"):
+        version = _git_version()
+        if version:
+            return version
+
+    try:
+        return metadata.version("kagi-cli")
+    except metadata.PackageNotFoundError:
+        return "0.0.0+unknown"
@@ -1,31 +1,64 @@
 from __future__ import annotations
 
 import json
+from collections import deque
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
 
+from kagi_client._json import JSONDecodeError, dumps, loads
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
-from kagi_client.models import AssistantMessage, AssistantResult, AssistantThread
-from kagi_client.streams import parse_kagi_stream_line, parse_kagi_stream_lines
+from kagi_client.http import ServiceClient, borrow_http_client
+from kagi_client.models import (
+    AssistantDelta,
+    AssistantMessage,
+    AssistantResult,
+    AssistantThread,
+)
+from kagi_client.streams import KagiStreamLine, aiter_kagi_stream_lines
 
 _decoder = json.JSONDecoder()
 
 
 def _parse_json(payload: str) -> Any:
     """Parse the first JSON object from a payload, ignoring trailing data."""
-    obj, _ = _decoder.raw_decode(payload.strip())
-    return obj
+    try:
+        return loads(payload)
+    except JSONDecodeError:
+        # Rare: trailing data after the object. Only the stdlib decoder can
+        # stop at the end of the first value.
+        obj, _ = _decoder.raw_decode(payload.strip())
+        return obj
 
 
 ASSISTANT_URL = "https://kagi.com/assistant/prompt"
-
-
-class AssistantClient:
-    def __init__(self, auth: KagiAuth) -> None:
+_HEADERS = {
+    "accept": "application/vnd.kagi.stream",
+    "content-type": "application/json",
+    "origin": "https://kagi.com",
+    "referer": "https://kagi.com/assistant",
+}
+
+# Constant parts of the prompt body; _build_body only fills in the per-call
+# fields.
+_BODY_TEMPLATE: dict[str, Any] = {
+    "focus": {"branch_id": "00000000-0000-4000-0000-000000000000"},
+    "profile": {"id": None, "personalizations": True, "lens_id": None},
+    "threads": [{"tag_ids": [], "saved": False, "shared": False}],
+}
+
+
+class AssistantClient(ServiceClient):
+    def __init__(
+        self,
+        auth: KagiAuth,
+        http: httpx.AsyncClient | None = None,
+    ) -> None:
         self._auth = auth
+        self._http = http
 
     def _build_body(
         self,
@@ -36,54 +69,43 @@ class AssistantClient:
     ) -> dict[str, Any]:
         return {
             "focus": {
+                **_BODY_TEMPLATE["focus"],
                 "thread_id": thread_id,
-                "branch_id": "00000000-0000-4000-0000-000000000000",
                 "prompt": text,
             },
             "profile": {
-                "id": None,
-                "personalizations": True,
+                **_BODY_TEMPLATE["profile"],
                 "internet_access": internet_access,
                 "model": model,
-                "lens_id": None,
             },
-            "threads": [{"tag_ids": [], "saved": False, "shared": False}],
-        }
-
-    def _headers(self) -> dict[str, str]:
-        return {
-            "accept": "application/vnd.kagi.stream",
-            "content-type": "application/json",
-            "origin": "https://kagi.com",
-            "referer": "https://kagi.com/assistant",
+            "threads": _BODY_TEMPLATE["threads"],
         }
 
-    def _cookies(self) -> dict[str, str]:
-        return {"kagi_session": self._auth.kagi_session}
-
-    async def _request(
+    @asynccontextmanager
+    async def _stream(
         self,
         text: str,
         model: str = "gpt-5-mini",
         thread_id: str | None = None,
         internet_access: bool = True,
-    ) -> httpx.Response:
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streaming prompt response, raising APIError on HTTP errors."""
         body = self._build_body(text, model, thread_id, internet_access)
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(
+        async with borrow_http_client(self._http) as client:
+            async with client.stream(
+                "POST",
                 ASSISTANT_URL,
-                json=body,
-                cookies=self._cookies(),
-                headers=self._headers(),
-            )
-        if resp.status_code != 200:
-            raise APIError(
-                f"Assistant request failed: {resp.status_code}",
-                status_code=resp.status_code,
-                body=resp.text,
-            )
-        return resp
+                content=dumps(body),
+                headers={**_HEADERS, "cookie": self._auth.session_cookie},
+            ) as resp:
+                if resp.status_code != 200:
+                    await resp.aread()
+                    raise APIError(
+                        f"Assistant request failed: {resp.status_code}",
+                        status_code=resp.status_code,
+                        body=resp.text,
+                    )
+                yield resp
 
     async def prompt(
         self,
@@ -92,13 +114,16 @@ class AssistantClient:
         thread_id: str | None = None,
         internet_access: bool = True,
     ) -> AssistantResult:
-        resp = await self._request(
+        builder = _AssistantResultBuilder()
+        async with self._stream(
             text,
             model=model,
             thread_id=thread_id,
             internet_access=internet_access,
-        )
-        return _parse_assistant_response(resp.text)
+        ) as resp:
+            async for line in aiter_kagi_stream_lines(resp.aiter_text()):
+                builder.feed(line)
+        return builder.build()
 
     async def prompt_stream(
         self,
@@ -108,48 +133,82 @@ class AssistantClient:
         internet_access: bool = True,
     ) -> AsyncIterator[str]:
         """Stream tokens via HTTP streaming, yielding full accumulated HTML snapshots."""
-        body = self._build_body(text, model, thread_id, internet_access)
         prev_text = ""
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            async with client.stream(
-                "POST",
-                ASSISTANT_URL,
-                json=body,
-                cookies=self._cookies(),
-                headers=self._headers(),
-            ) as resp:
-                if resp.status_code != 200:
-                    await resp.aread()
-                    raise APIError(
-                        f"Assistant request failed: {resp.status_code}",
-                        status_code=resp.status_code,
-                        body=resp.text,
-                    )
-                async for raw_line in resp.aiter_lines():
-                    parsed = parse_kagi_stream_line(raw_line)
-                    if parsed is None or parsed.tag != "tokens.json":
-                        continue
-                    try:
-                        data = _parse_json(parsed.payload)
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-                    full_text = data.get("text", "")
-                    if full_text and full_text != prev_text:
-                        prev_text = full_text
-                        yield full_text
-
-
-def _parse_assistant_response(response_text: str) -> AssistantResult:
-    lines = parse_kagi_stream_lines(response_text)
-
-    thread: AssistantThread | None = None
-    message: AssistantMessage | None = None
-
-    for line in lines:
+        async with self._stream(
+            text,
+            model=model,
+            thread_id=thread_id,
+            internet_access=internet_access,
+        ) as resp:
+            async for line in aiter_kagi_stream_lines(resp.aiter_text()):
+                if line.tag != "tokens.json":
+                    continue
+                try:
+                    data = _parse_json(line.payload)
+                except (json.JSONDecodeError, ValueError):
+                    continue
+                full_text = data.get("text", "")
+                if full_text and full_text != prev_text:
+                    prev_text = full_text
+                    yield full_text
+
+    async def prompt_stream_deltas(
+        self,
+        text: str,
+        model: str = "gpt-5-mini",
+        thread_id: str | None = None,
+        internet_access: bool = True,
+    ) -> AsyncIterator[AssistantDelta]:
+        """Stream only what changed between HTML snapshots.
+
+        Applying each delta in order to an empty string rebuilds the latest
+        snapshot, so consumers can keep incremental state instead of
+        re-scanning the whole reply on every token.
+        """
+        prev_text = ""
+        async for snapshot in self.prompt_stream(
+            text,
+            model=model,
+            thread_id=thread_id,
+            internet_access=internet_access,
+        ):
+            start = _common_prefix_len(prev_text, snapshot)
+            prev_text = snapshot
+            yield AssistantDelta(start=start, text=snapshot[start:])
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    if b.startswith(a):
+        # Common case: the reply only grew.
+        return len(a)
+    # Binary search on slice equality keeps the comparison in C.
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+# Stream lines kept for the body of a "missing thread/message" APIError
+_ERROR_TAIL_LINES = 20
+
+
+class _AssistantResultBuilder:
+    """Collect the thread and final message from Kagi stream lines."""
+
+    def __init__(self) -> None:
+        self._thread: AssistantThread | None = None
+        self._message: AssistantMessage | None = None
+        self._tail: deque[KagiStreamLine] = deque(maxlen=_ERROR_TAIL_LINES)
+
+    def feed(self, line: KagiStreamLine) -> None:
+        self._tail.append(line)
         if line.tag == "thread.json":
             data = _parse_json(line.payload)
-            thread = AssistantThread(
+            self._thread = AssistantThread(
                 id=data["id"],
                 title=data["title"],
                 created_at=data["created_at"],
@@ -160,7 +219,7 @@ def _parse_assistant_response(response_text: str) -> AssistantResult:
         elif line.tag == "new_message.json":
             data = _parse_json(line.payload)
             # Keep the last new_message (the "done" state one)
-            message = AssistantMessage(
+            self._message = AssistantMessage(
                 id=data["id"],
                 created_at=data["created_at"],
                 state=data["state"],
@@ -169,17 +228,21 @@ def _parse_assistant_response(response_text: str) -> AssistantResult:
                 md=data.get("md"),
             )
 
-    if thread is None:
-        raise APIError(
-            "No thread.json found in response",
-            status_code=200,
-            body=response_text,
-        )
-    if message is None:
-        raise APIError(
-            "No new_message.json found in response",
-            status_code=200,
-            body=response_text,
-        )
-
-    return AssistantResult(thread=thread, message=message)
+    def build(self) -> AssistantResult:
+        if self._thread is None:
+            raise APIError(
+                "No thread.json found in response",
+                status_code=200,
+                body=self._tail_text(),
+            )
+        if self._message is None:
+            raise APIError(
+                "No new_message.json found in response",
+                status_code=200,
+                body=self._tail_text(),
+            )
+        return AssistantResult(thread=self._thread, message=self._message)
+
+    def _tail_text(self) -> str:
+        """The last stream lines seen, re-joined in the wire format."""
+        return "\n".join(f"{line.tag}:{line.payload}" for line in self._tail)
@@ -1,28 +1,60 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
 import time
 
 import httpx
-import jwt
 
+from kagi_client._json import JSONDecodeError, loads
 from kagi_client.errors import AuthError
+from kagi_client.http import borrow_http_client
 from kagi_client.models import TokenPayload
 
 AUTH_URL = "https://translate.kagi.com/api/auth"
 
+# Treat tokens this close to expiry as expired so a request never races the
+# server-side expiry.
+EXPIRY_LEEWAY_SECONDS = 5
+
 
 class KagiAuth:
-    def __init__(self, kagi_session: str) -> None:
+    def __init__(
+        self,
+        kagi_session: str,
+        http: httpx.AsyncClient | None = None,
+    ) -> None:
         self.kagi_session = kagi_session
+        self._http = http
         self._token: str | None = None
+        # Last token decoded and its payload, so the hot path skips decoding
+        self._decoded: tuple[str, TokenPayload] | None = None
+        # Serialises refreshes so concurrent callers share one auth request
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def session_cookie(self) -> str:
+        """Cookie header value carrying the Kagi session.
+
+        Sent as an explicit header rather than through the shared
+        AsyncClient's cookie jar, so cookies set by one endpoint are never
+        replayed to the others.
+        """
+        return f"kagi_session={self.kagi_session}"
 
     def decode_token(self, token: str) -> TokenPayload:
-        payload = jwt.decode(
-            token,
-            algorithms=["HS256"],
-            options={"verify_signature": False},
-        )
-        return TokenPayload(
+        decoded = self._decoded
+        if decoded is not None and decoded[0] == token:
+            return decoded[1]
+        # The signature is never verified (the key is Kagi's), so the payload
+        # segment is decoded directly rather than through a JWT library.
+        try:
+            _, payload_b64, _ = token.split(".")
+            payload = loads(base64.urlsafe_b64decode(payload_b64 + "=="))
+        except (ValueError, binascii.Error, JSONDecodeError) as exc:
+            raise AuthError(f"Malformed token: {exc}") from exc
+        token_payload = TokenPayload(
             subscription=payload["subscription"],
             id=payload["id"],
             logged_in=payload["loggedIn"],
@@ -30,17 +62,17 @@ class KagiAuth:
             iat=payload["iat"],
             exp=payload["exp"],
         )
+        self._decoded = (token, token_payload)
+        return token_payload
 
     def is_token_expired(self, token: str) -> bool:
-        payload = self.decode_token(token)
-        return payload.exp <= int(time.time())
+        return self.decode_token(token).exp <= int(time.time()) + EXPIRY_LEEWAY_SECONDS
 
     async def refresh_token(self) -> str:
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with borrow_http_client(self._http) as client:
             resp = await client.get(
                 AUTH_URL,
-                cookies={"kagi_session": self.kagi_session},
+                headers={"cookie": self.session_cookie},
             )
         if resp.status_code != 200:
             raise AuthError(
@@ -53,4 +85,8 @@ class KagiAuth:
     async def get_valid_token(self) -> str:
         if self._token is not None and not self.is_token_expired(self._token):
             return self._token
-        return await self.refresh_token()
+        async with self._refresh_lock:
+            # Another caller may have refreshed while this one waited.
+            if self._token is not None and not self.is_token_expired(self._token):
+                return self._token
+            return await self.refresh_token()
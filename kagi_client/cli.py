@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import io
 import os
-import subprocess
 import sys
+from collections.abc import Callable, Coroutine
 from html.parser import HTMLParser
-from importlib import metadata
-from typing import Annotated
+from typing import Annotated, Any, ClassVar
 
 import typer
 from rich.console import Console
@@ -14,6 +15,7 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 
+from kagi_client._version import resolve_version
 from kagi_client.client import KagiClient
 from kagi_client.formatters import (
     OutputFormat,
@@ -30,6 +32,7 @@ from kagi_client.formatters import (
     summarize_json,
     summarize_md,
 )
+from kagi_client.models import SearchResult
 
 app = typer.Typer(
     name="kagi",
@@ -47,111 +50,201 @@ err_console = Console(stderr=True)
 class _HTMLStripper(HTMLParser):
     def __init__(self) -> None:
         super().__init__()
-        self._parts: list[str] = []
+        self._buf = io.StringIO()
 
     def handle_data(self, data: str) -> None:
-        self._parts.append(data)
+        self._buf.write(data)
 
     def get_text(self) -> str:
-        return "".join(self._parts)
+        return self._buf.getvalue()
+
+
+def _has_markup(text: str) -> bool:
+    """Whether text contains tags or character references needing a parser."""
+    return "<" in text or "&" in text
 
 
 def strip_html(html: str) -> str:
+    if not _has_markup(html):
+        return html
     stripper = _HTMLStripper()
     stripper.feed(html)
     return stripper.get_text()
 
 
+_Attrs = list[tuple[str, str | None]]
+_HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Markdown prefix per heading level, indexed by the digit in the tag name
+_HASHES = ("", "# ", "## ", "### ", "#### ", "##### ", "###### ")
+
+
+@functools.lru_cache(maxsize=64)
+def _code_fence(lang: str) -> str:
+    # Replies tend to repeat a handful of languages; share the fence strings.
+    return f"```{lang}\n"
+
+
 class _HTMLToMarkdown(HTMLParser):
     """Convert HTML to Markdown, preserving code blocks and structure."""
 
     def __init__(self) -> None:
         super().__init__()
-        self._parts: list[str] = []
+        self._buf = io.StringIO()
+        # Trailing newlines of the last write (0, 1 or 2+); the start of the
+        # document counts as a block boundary.
+        self._tail_nl = 2
         self._in_pre = False
         self._in_code_block = False
         self._block_just_closed = False
 
+    def _append(self, text: str) -> None:
+        self._buf.write(text)
+        if text.endswith("\n\n"):
+            self._tail_nl = 2
+        elif text.endswith("\n"):
+            self._tail_nl = 1
+        else:
+            self._tail_nl = 0
+
+    def _ensure_newline(self) -> None:
+        if self._tail_nl == 0:
+            self._buf.write("\n")
+            self._tail_nl = 1
+
     def _ensure_blank_line(self) -> None:
         """Add blank line separator between block elements if needed."""
-        if self._parts and not self._parts[-1].endswith("\n\n"):
-            if self._parts[-1].endswith("\n"):
-                self._parts.append("\n")
-            else:
-                self._parts.append("\n\n")
+        if self._tail_nl < 2:
+            self._buf.write("\n" * (2 - self._tail_nl))
+            self._tail_nl = 2
+
+    # -- Start tags --
+
+    def _start_pre(self, tag: str, attrs: _Attrs) -> None:
+        self._in_pre = True
+        self._ensure_blank_line()
+
+    def _start_code(self, tag: str, attrs: _Attrs) -> None:
+        if not self._in_pre:
+            self._append("`")
+            return
+        self._in_code_block = True
+        lang = next(
+            (
+                value[9:]
+                for name, value in attrs
+                if name == "class" and value and value.startswith("language-")
+            ),
+            "",
+        )
+        self._append(_code_fence(lang))
+
+    def _start_p(self, tag: str, attrs: _Attrs) -> None:
+        if not self._in_pre:
+            self._ensure_blank_line()
+
+    def _start_br(self, tag: str, attrs: _Attrs) -> None:
+        self._append("\n")
+
+    def _start_heading(self, tag: str, attrs: _Attrs) -> None:
+        self._ensure_blank_line()
+        self._append(_HASHES[ord(tag[1]) - 48])
+
+    def _start_li(self, tag: str, attrs: _Attrs) -> None:
+        self._ensure_newline()
+        self._append("- ")
+
+    def _start_bold(self, tag: str, attrs: _Attrs) -> None:
+        self._append("**")
+
+    def _start_em(self, tag: str, attrs: _Attrs) -> None:
+        self._append("*")
+
+    _START: ClassVar[dict[str, Callable[[_HTMLToMarkdown, str, _Attrs], None]]] = {
+        "pre": _start_pre,
+        "code": _start_code,
+        "p": _start_p,
+        "br": _start_br,
+        **dict.fromkeys(_HEADINGS, _start_heading),
+        "li": _start_li,
+        "strong": _start_bold,
+        "b": _start_bold,
+        "em": _start_em,
+        "i": _start_em,
+    }
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
         self._block_just_closed = False
-        if tag == "pre":
-            self._in_pre = True
-            self._ensure_blank_line()
-        elif tag == "code" and self._in_pre:
-            self._in_code_block = True
-            lang = ""
-            for name, value in attrs:
-                if name == "class" and value and value.startswith("language-"):
-                    lang = value[9:]
-            self._parts.append(f"```{lang}\n")
-        elif tag == "p" and not self._in_pre:
-            self._ensure_blank_line()
-        elif tag == "br":
-            self._parts.append("\n")
-        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
-            self._ensure_blank_line()
-            level = int(tag[1])
-            self._parts.append("#" * level + " ")
-        elif tag == "li":
-            if self._parts and not self._parts[-1].endswith("\n"):
-                self._parts.append("\n")
-            self._parts.append("- ")
-        elif tag == "strong" or tag == "b":
-            self._parts.append("**")
-        elif tag == "em" or tag == "i":
-            self._parts.append("*")
-        elif tag == "code" and not self._in_pre:
-            self._parts.append("`")
+        handler = self._START.get(tag)
+        if handler is not None:
+            handler(self, tag, attrs)
 
-    def handle_endtag(self, tag: str) -> None:
-        if tag == "code" and self._in_code_block:
+    # -- End tags --
+
+    def _end_code(self) -> None:
+        if self._in_code_block:
             self._in_code_block = False
             # Ensure newline before closing fence
-            if self._parts and not self._parts[-1].endswith("\n"):
-                self._parts.append("\n")
-            self._parts.append("```\n")
-            self._block_just_closed = True
-        elif tag == "pre":
-            self._in_pre = False
-        elif tag in ("strong", "b"):
-            self._parts.append("**")
-        elif tag in ("em", "i"):
-            self._parts.append("*")
-        elif tag == "code" and not self._in_pre:
-            self._parts.append("`")
-        elif tag in ("p", "h1", "h2", "h3", "h4", "h5", "h6"):
+            self._ensure_newline()
+            self._append("```\n")
             self._block_just_closed = True
+        elif not self._in_pre:
+            self._append("`")
+
+    def _end_bold(self) -> None:
+        self._append("**")
+
+    def _end_em(self) -> None:
+        self._append("*")
+
+    def _end_pre(self) -> None:
+        self._in_pre = False
+
+    def _end_block(self) -> None:
+        self._block_just_closed = True
+
+    _END: ClassVar[dict[str, Callable[[_HTMLToMarkdown], None]]] = {
+        "code": _end_code,
+        "pre": _end_pre,
+        "strong": _end_bold,
+        "b": _end_bold,
+        "em": _end_em,
+        "i": _end_em,
+        "p": _end_block,
+        **dict.fromkeys(_HEADINGS, _end_block),
+    }
+
+    def handle_endtag(self, tag: str) -> None:
+        handler = self._END.get(tag)
+        if handler is not None:
+            handler(self)
 
     def handle_data(self, data: str) -> None:
         if self._in_code_block:
             # Preserve whitespace exactly inside code blocks
-            self._parts.append(data)
+            self._append(data)
         elif self._block_just_closed and not data.strip():
             # Skip whitespace-only text between block elements
             pass
         else:
             self._block_just_closed = False
-            self._parts.append(data)
+            self._append(data)
 
     def get_markdown(self) -> str:
-        return "".join(self._parts).strip()
+        return self._buf.getvalue().strip()
 
 
 def html_to_markdown(html: str) -> str:
     """Convert HTML to Markdown, preserving code blocks and structure."""
+    if not _has_markup(html):
+        return html.strip()
     converter = _HTMLToMarkdown()
     converter.feed(html)
     return converter.get_markdown()
 
 
+_THINKING_END = "</details>"
+
+
 def _split_thinking(html: str) -> tuple[str, str]:
     """Split HTML on the </details> boundary.
 
@@ -159,48 +252,21 @@ def _split_thinking(html: str) -> tuple[str, str]:
     text inside the <details> block and response_html is everything after
     </details>.  If no </details> is found, returns ("", "").
     """
-    marker = "</details>"
-    idx = html.find(marker)
+    idx = html.find(_THINKING_END)
     if idx == -1:
         return ("", "")
     thinking_html = html[:idx]
-    response_html = html[idx + len(marker) :]
+    response_html = html[idx + len(_THINKING_END) :]
     return (strip_html(thinking_html), response_html)
 
 
 # -- Helpers --
 
 
-def _resolve_version() -> str:
-    # Prefer the checked-out git tag so `kagi --version` follows releases.
-    git_commands = [
-        ["git", "describe", "--tags", "--exact-match"],
-        ["git", "describe", "--tags", "--always", "--dirty"],
-    ]
-    for command in git_commands:
-        try:
-            result = subprocess.run(
-                command,
-                check=True,
-                text=True,
-                capture_output=True,
-            )
-            version = result.stdout.strip()
-            if version:
-                return version
-        except (subprocess.SubprocessError, OSError):
-            continue
-
-    try:
-        return metadata.version("kagi-cli")
-    except metadata.PackageNotFoundError:
-        return "0.0.0+unknown"
-
-
 def _version_callback(value: bool) -> None:
     if not value:
         return
-    typer.echo(_resolve_version())
+    typer.echo(resolve_version())
     raise typer.Exit(code=0)
 
 
@@ -212,6 +278,16 @@ def _get_session() -> str:
     return session
 
 
+def _run_async(coro: Coroutine[Any, Any, None]) -> None:
+    """Run a command coroutine, on uvloop when the speedups extra is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+
+
 def _read_text(text: str) -> str:
     """Read text from argument or stdin if '-'."""
     if text == "-":
@@ -224,6 +300,11 @@ FormatOption = Annotated[
     typer.Option("--format", "-F", help="Output format: console, json, md, csv"),
 ]
 
+CompactOption = Annotated[
+    bool,
+    typer.Option("--compact", help="Print JSON on a single line (with --format json)"),
+]
+
 
 # -- Commands --
 
@@ -263,6 +344,7 @@ def proofread(
         str, typer.Option("--model", "-m", help="Model selection")
     ] = "standard",
     fmt: FormatOption = OutputFormat.console,
+    compact: CompactOption = False,
 ) -> None:
     """Proofread text using Kagi."""
     session = _get_session()
@@ -281,7 +363,7 @@ def proofread(
             )
 
         if fmt == OutputFormat.json:
-            print(proofread_json(result))
+            print(proofread_json(result, compact=compact))
         elif fmt == OutputFormat.md:
             print(proofread_md(result), end="")
         elif fmt == OutputFormat.csv:
@@ -319,7 +401,7 @@ def proofread(
         else:
             console.print(result.text)
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -329,6 +411,7 @@ def summarize(
         str, typer.Option("--type", "-t", help="Summary type: takeaway or summary")
     ] = "takeaway",
     fmt: FormatOption = OutputFormat.console,
+    compact: CompactOption = False,
 ) -> None:
     """Summarize a URL using Kagi."""
     session = _get_session()
@@ -338,7 +421,7 @@ def summarize(
             result = await client.summarize(url, summary_type=summary_type)
 
         if fmt == OutputFormat.json:
-            print(summarize_json(result))
+            print(summarize_json(result, compact=compact))
         elif fmt == OutputFormat.md:
             print(summarize_md(result), end="")
         elif fmt == OutputFormat.csv:
@@ -366,7 +449,7 @@ def summarize(
             table.add_row("Time Saved", f"{ws.time_saved}s")
             console.print(table)
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -381,7 +464,12 @@ def ask(
     no_internet: Annotated[
         bool, typer.Option("--no-internet", help="Disable internet access")
     ] = False,
+    progress: Annotated[
+        bool,
+        typer.Option("--progress", help="Print a dot to stderr per streamed update"),
+    ] = False,
     fmt: FormatOption = OutputFormat.console,
+    compact: CompactOption = False,
 ) -> None:
     """Ask Kagi Assistant a question."""
     session = _get_session()
@@ -397,41 +485,40 @@ def ask(
                     internet_access=not no_internet,
                 )
                 if fmt == OutputFormat.json:
-                    print(ask_json(result))
+                    print(ask_json(result, compact=compact))
                 elif fmt == OutputFormat.md:
                     print(ask_md(result), end="")
                 elif fmt == OutputFormat.csv:
                     print(ask_csv(result), end="")
                 return
 
-            thinking_text_out = ""
-            last_response_html = ""
-            thinking_done = False
+            # Only the final snapshot is rendered, so intermediate ones are
+            # not parsed at all.
+            latest = ""
             async for snapshot in client.prompt_stream(
                 body,
                 model=model,
                 thread_id=thread,
                 internet_access=not no_internet,
             ):
-                if not thinking_done:
-                    thinking_text, response_html = _split_thinking(snapshot)
-                    if not thinking_text:
-                        continue
-                    thinking_done = True
-                    thinking_text_out = thinking_text
-                    last_response_html = response_html
-                else:
-                    _, response_html = _split_thinking(snapshot)
-                    last_response_html = response_html
-
-        if thinking_text_out.strip():
-            console.print(f"[dim]{thinking_text_out.strip()}[/dim]")
+                latest = snapshot
+                if progress:
+                    err_console.file.write(".")
+                    err_console.file.flush()
+            if progress:
+                err_console.file.write("\n")
+
+        thinking_text, response_html = _split_thinking(latest)
+        if not thinking_text:
+            return
+        if thinking_text.strip():
+            console.print(f"[dim]{thinking_text.strip()}[/dim]")
             console.print()
-        if last_response_html:
-            md = html_to_markdown(last_response_html)
+        if response_html:
+            md = html_to_markdown(response_html)
             console.print(Markdown(md))
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -441,28 +528,42 @@ def search(
         bool, typer.Option("--all", "-a", help="Fetch all pages")
     ] = False,
     fmt: FormatOption = OutputFormat.console,
+    compact: CompactOption = False,
 ) -> None:
     """Search using Kagi."""
     session = _get_session()
 
     async def _run() -> None:
+        results: list[SearchResult] = []
+        # Pages without parsed items are shown as plain text; strip their
+        # markup in a worker thread while later pages are still downloading.
+        plain_texts: list[asyncio.Task[str] | None] = []
+
+        def _collect(page: SearchResult) -> None:
+            results.append(page)
+            if fmt == OutputFormat.console and not page.items:
+                plain_texts.append(
+                    asyncio.create_task(asyncio.to_thread(strip_html, page.search_html))
+                )
+            else:
+                plain_texts.append(None)
+
         async with KagiClient(session) as client:
             if all_pages:
-                results = []
                 async for page in client.search_all(query):
-                    results.append(page)
+                    _collect(page)
             else:
-                results = [await client.search(query)]
+                _collect(await client.search(query))
 
         if fmt == OutputFormat.json:
-            print(search_json(results))
+            print(search_json(results, compact=compact))
         elif fmt == OutputFormat.md:
             print(search_md(results), end="")
         elif fmt == OutputFormat.csv:
             print(search_csv(results), end="")
         else:
-            for result in results:
-                if result.items:
+            for result, plain_text_task in zip(results, plain_texts):
+                if plain_text_task is None:
                     for i, item in enumerate(result.items, 1):
                         console.print(f"[bold]{i}. {item.title}[/bold]")
                         console.print(f"   {item.url}")
@@ -474,7 +575,7 @@ def search(
                             console.print(f"   {item.description}")
                         console.print()
                 else:
-                    plain_text = strip_html(result.search_html)
+                    plain_text = await plain_text_task
                     console.print(Panel(plain_text, title="Search Results"))
                     console.print()
 
@@ -502,4 +603,4 @@ def search(
                         )
                     console.print(table)
 
-    asyncio.run(_run())
+    _run_async(_run())
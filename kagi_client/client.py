@@ -6,7 +6,9 @@ from typing import Any
 
 from kagi_client.assistant import AssistantClient
 from kagi_client.auth import KagiAuth
+from kagi_client.http import create_http_client
 from kagi_client.models import (
+    AssistantDelta,
     AssistantResult,
     ProofreadResult,
     SearchResult,
@@ -15,16 +17,33 @@ from kagi_client.models import (
 )
 from kagi_client.proofread import ProofreadClient
 from kagi_client.search import SearchClient
-from kagi_client.summarizer import SummarizerClient
+from kagi_client.summarizer import (
+    SUMMARY_CACHE_SIZE,
+    SUMMARY_CACHE_TTL,
+    SummarizerClient,
+)
 
 
 class KagiClient:
-    def __init__(self, kagi_session: str) -> None:
-        self._auth = KagiAuth(kagi_session=kagi_session)
-        self._proofread = ProofreadClient(auth=self._auth)
-        self._summarizer = SummarizerClient(auth=self._auth)
-        self._assistant = AssistantClient(auth=self._auth)
-        self._search = SearchClient(auth=self._auth)
+    def __init__(
+        self,
+        kagi_session: str,
+        summary_cache_size: int = SUMMARY_CACHE_SIZE,
+        summary_cache_ttl: float = SUMMARY_CACHE_TTL,
+    ) -> None:
+        # One pooled client for every service so keep-alive connections and
+        # TLS sessions to kagi.com are reused across requests.
+        self._http = create_http_client()
+        self._auth = KagiAuth(kagi_session=kagi_session, http=self._http)
+        self._proofread = ProofreadClient(auth=self._auth, http=self._http)
+        self._summarizer = SummarizerClient(
+            auth=self._auth,
+            http=self._http,
+            cache_size=summary_cache_size,
+            cache_ttl=summary_cache_ttl,
+        )
+        self._assistant = AssistantClient(auth=self._auth, http=self._http)
+        self._search = SearchClient(auth=self._auth, http=self._http)
 
     async def __aenter__(self) -> KagiClient:
         return self
@@ -35,7 +54,10 @@ class KagiClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        pass
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
 
     # -- Proofread --
 
@@ -110,6 +132,14 @@ class KagiClient:
         async for token in self._assistant.prompt_stream(text, **kwargs):
             yield token
 
+    async def prompt_stream_deltas(
+        self,
+        text: str,
+        **kwargs: Any,
+    ) -> AsyncIterator[AssistantDelta]:
+        async for delta in self._assistant.prompt_stream_deltas(text, **kwargs):
+            yield delta
+
     # -- Search --
 
     async def search(
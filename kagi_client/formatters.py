@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import csv
 import io
-import json
-from dataclasses import asdict
+import re
+from collections.abc import Iterable, Iterator, Sequence
 from enum import Enum
+from typing import Any
 
+from kagi_client._json import dumps, dumps_pretty
 from kagi_client.models import (
     AssistantResult,
     ProofreadResult,
+    SearchItem,
     SearchResult,
     SummaryResult,
 )
@@ -24,22 +27,28 @@ class OutputFormat(str, Enum):
 # -- helpers --
 
 
-def _to_json(obj: object) -> str:
-    return json.dumps(asdict(obj), indent=2, ensure_ascii=False)  # type: ignore[arg-type]
+def _to_json(data: Any, compact: bool = False) -> str:
+    if compact:
+        return dumps(data).decode()
+    return dumps_pretty(data)
+
+
+_DETAILS_RE = re.compile(r"<details>.*?</details>\s*", re.DOTALL)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
 
 
 def _strip_details(text: str) -> str:
     """Remove the <details>...</details> thinking block and return the rest."""
-    import re
-
-    return re.sub(r"<details>.*?</details>\s*", "", text, flags=re.DOTALL).strip()
+    if "<details>" not in text:
+        return text.strip()
+    return _DETAILS_RE.sub("", text).strip()
 
 
 def _strip_html(html: str) -> str:
     """Remove all HTML tags, keeping only text content."""
-    import re
-
-    return re.sub(r"<[^>]+>", "", html).strip()
+    if "<" not in html:
+        return html.strip()
+    return _HTML_TAG_RE.sub("", html).strip()
 
 
 def _extract_response(result: AssistantResult) -> str:
@@ -51,7 +60,35 @@ def _extract_response(result: AssistantResult) -> str:
     return ""
 
 
-def _csv_rows(header: list[str], rows: list[list[str]]) -> str:
+# Cells the csv module's default (excel) dialect would quote
+_CSV_QUOTE_RE = re.compile(r'[",\r\n]')
+
+
+def _csv_cell(value: str) -> str:
+    if _CSV_QUOTE_RE.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _csv_line(row: Sequence[str]) -> str:
+    if len(row) == 1 and row[0] == "":
+        # csv quotes a lone empty cell so the row is not read back as blank
+        return '""'
+    return ",".join([_csv_cell(cell) for cell in row])
+
+
+def _csv_rows(header: list[str], rows: Iterable[Sequence[str]]) -> str:
+    rows = list(rows)
+    try:
+        lines = [_csv_line(header), *[_csv_line(row) for row in rows]]
+    except TypeError:
+        # A non-str cell; let the csv module do the conversion.
+        return _csv_rows_slow(header, rows)
+    lines.append("")
+    return "\r\n".join(lines)
+
+
+def _csv_rows_slow(header: list[str], rows: Iterable[Sequence[str]]) -> str:
     buf = io.StringIO()
     writer = csv.writer(buf)
     writer.writerow(header)
@@ -62,8 +99,8 @@ def _csv_rows(header: list[str], rows: list[list[str]]) -> str:
 # -- proofread --
 
 
-def proofread_json(result: ProofreadResult) -> str:
-    return _to_json(result)
+def proofread_json(result: ProofreadResult, compact: bool = False) -> str:
+    return _to_json(result.to_dict(), compact)
 
 
 def proofread_md(result: ProofreadResult) -> str:
@@ -75,21 +112,21 @@ def proofread_md(result: ProofreadResult) -> str:
         t = a.tone_analysis
         parts.append(f"## Tone\n\n**{t.overall_tone}** -- {t.description}")
         s = a.writing_statistics
-        lines = [
-            "## Writing Statistics\n",
-            "| Metric | Value |",
-            "|--------|-------|",
-            f"| Word Count | {s.word_count} |",
-            f"| Character Count | {s.character_count} |",
-            f"| Sentences | {s.sentence_count} |",
-            f"| Paragraphs | {s.paragraph_count} |",
-            f"| Avg Words/Sentence | {s.average_words_per_sentence:.1f} |",
-            f"| Vocabulary Diversity | {s.vocabulary_diversity:.2f} |",
-            f"| Reading Level | {s.reading_level} |",
-            f"| Readability Score | {s.readability_score:.1f} |",
-            f"| Reading Time | {s.reading_time_minutes:.1f} min |",
-        ]
-        parts.append("\n".join(lines))
+        # Adjacent literals compile to a single string build.
+        parts.append(
+            "## Writing Statistics\n\n"
+            "| Metric | Value |\n"
+            "|--------|-------|\n"
+            f"| Word Count | {s.word_count} |\n"
+            f"| Character Count | {s.character_count} |\n"
+            f"| Sentences | {s.sentence_count} |\n"
+            f"| Paragraphs | {s.paragraph_count} |\n"
+            f"| Avg Words/Sentence | {s.average_words_per_sentence:.1f} |\n"
+            f"| Vocabulary Diversity | {s.vocabulary_diversity:.2f} |\n"
+            f"| Reading Level | {s.reading_level} |\n"
+            f"| Readability Score | {s.readability_score:.1f} |\n"
+            f"| Reading Time | {s.reading_time_minutes:.1f} min |"
+        )
     else:
         parts.append(result.text)
     return "\n\n".join(parts) + "\n"
@@ -125,8 +162,8 @@ def proofread_csv(result: ProofreadResult) -> str:
 # -- summarize --
 
 
-def summarize_json(result: SummaryResult) -> str:
-    return _to_json(result)
+def summarize_json(result: SummaryResult, compact: bool = False) -> str:
+    return _to_json(result.to_dict(), compact)
 
 
 def summarize_md(result: SummaryResult) -> str:
@@ -135,22 +172,25 @@ def summarize_md(result: SummaryResult) -> str:
     parts.append(result.markdown)
     meta = result.response_metadata
     ws = result.word_stats
-    rows = [
-        "## Metadata\n",
-        "| Field | Value |",
-        "|-------|-------|",
-        f"| Model | {meta.model} |",
-    ]
-    if meta.speed is not None:
-        rows.append(f"| Speed | {meta.speed:.1f} tok/s |")
-    rows.append(f"| Tokens | {meta.tokens} |")
-    rows.append(f"| Cost | ${meta.cost:.4f} |")
-    if result.elapsed_seconds is not None:
-        rows.append(f"| Elapsed | {result.elapsed_seconds:.1f}s |")
-    rows.append(f"| Source Words | {ws.n_words} |")
-    rows.append(f"| Source Pages | {ws.n_pages} |")
-    rows.append(f"| Time Saved | {ws.time_saved}s |")
-    parts.append("\n".join(rows))
+    speed = f"| Speed | {meta.speed:.1f} tok/s |\n" if meta.speed is not None else ""
+    elapsed = (
+        f"| Elapsed | {result.elapsed_seconds:.1f}s |\n"
+        if result.elapsed_seconds is not None
+        else ""
+    )
+    parts.append(
+        "## Metadata\n\n"
+        "| Field | Value |\n"
+        "|-------|-------|\n"
+        f"| Model | {meta.model} |\n"
+        f"{speed}"
+        f"| Tokens | {meta.tokens} |\n"
+        f"| Cost | ${meta.cost:.4f} |\n"
+        f"{elapsed}"
+        f"| Source Words | {ws.n_words} |\n"
+        f"| Source Pages | {ws.n_pages} |\n"
+        f"| Time Saved | {ws.time_saved}s |"
+    )
     return "\n\n".join(parts) + "\n"
 
 
@@ -177,10 +217,10 @@ def summarize_csv(result: SummaryResult) -> str:
 # -- ask --
 
 
-def ask_json(result: AssistantResult) -> str:
-    data = asdict(result)
+def ask_json(result: AssistantResult, compact: bool = False) -> str:
+    data = result.to_dict()
     data["response"] = _extract_response(result)
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    return _to_json(data, compact)
 
 
 def ask_md(result: AssistantResult) -> str:
@@ -202,42 +242,48 @@ def ask_csv(result: AssistantResult) -> str:
 # -- search --
 
 
-def search_json(results: list[SearchResult]) -> str:
+def search_json(results: list[SearchResult], compact: bool = False) -> str:
     if len(results) == 1:
-        return _to_json(results[0])
-    return json.dumps([asdict(r) for r in results], indent=2, ensure_ascii=False)
+        return _to_json(results[0].to_dict(), compact)
+    return _to_json([r.to_dict() for r in results], compact)
 
 
-def search_md(results: list[SearchResult]) -> str:
-    parts: list[str] = []
+def _search_md_item(i: int, item: SearchItem) -> str:
+    # Each item is one string ending in "\n", so joining items with "\n"
+    # leaves the blank separator line between them.
+    block = f"### {i}. [{item.title}]({item.url})\n"
+    if item.description:
+        block += f"{item.description}\n"
+    if item.web_archive_url:
+        block += f"[Archive]({item.web_archive_url})\n"
+    if item.date:
+        block += f"*{item.date}*\n"
+    return block
+
+
+def _search_md_parts(results: list[SearchResult]) -> Iterator[str]:
     for result in results:
         for i, item in enumerate(result.items, 1):
-            parts.append(f"### {i}. [{item.title}]({item.url})")
-            if item.description:
-                parts.append(item.description)
-            if item.web_archive_url:
-                parts.append(f"[Archive]({item.web_archive_url})")
-            if item.date:
-                parts.append(f"*{item.date}*")
-            parts.append("")
-        parts.append(f"**Share:** {result.info.share_url}")
-    return "\n".join(parts) + "\n"
+            yield _search_md_item(i, item)
+        yield f"**Share:** {result.info.share_url}"
+
+
+def search_md(results: list[SearchResult]) -> str:
+    return "\n".join(_search_md_parts(results)) + "\n"
 
 
 def search_csv(results: list[SearchResult]) -> str:
-    rows: list[list[str]] = []
-    for result in results:
-        for item in result.items:
-            rows.append(
-                [
-                    item.title,
-                    item.url,
-                    item.description,
-                    item.web_archive_url or "",
-                    item.date or "",
-                ]
-            )
     return _csv_rows(
         ["title", "url", "description", "archive_url", "date"],
-        rows,
+        (
+            (
+                item.title,
+                item.url,
+                item.description,
+                item.web_archive_url or "",
+                item.date or "",
+            )
+            for result in results
+            for item in result.items
+        ),
     )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import ssl
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cache
+from types import TracebackType
+from typing import Self
+
+import httpx
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, read=300.0)
+# Pinned explicitly: search_all keeps several batch requests in flight, and
+# every one of them should find an idle keep-alive connection to reuse.
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+
+@cache
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle is ~20 ms, nearly all of an AsyncClient's setup;
+    # build it once so short-lived borrowed clients stay cheap.
+    return httpx.create_ssl_context()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the AsyncClient shared by the Kagi service clients."""
+    return httpx.AsyncClient(
+        timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS, verify=_ssl_context()
+    )
+
+
+@asynccontextmanager
+async def borrow_http_client(
+    http: httpx.AsyncClient | None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the injected client, or a short-lived one when none was given.
+
+    Service clients created by KagiClient share one pooled connection; the
+    fallback keeps standalone service clients usable without a lifecycle.
+    """
+    if http is not None:
+        yield http
+        return
+    async with create_http_client() as client:
+        yield client
+
+
+class ServiceClient:
+    """Connection lifecycle shared by the per-service clients.
+
+    An injected client is used as-is and never closed here. Without one,
+    ``async with`` opens a pooled client for the duration of the block;
+    outside such a block each request borrows a short-lived client.
+    """
+
+    _http: httpx.AsyncClient | None
+    _owns_http = False
+
+    async def __aenter__(self) -> Self:
+        if self._http is None:
+            self._http = create_http_client()
+            self._owns_http = True
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the client opened by ``__aenter__``, if any."""
+        if self._owns_http and self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._owns_http = False
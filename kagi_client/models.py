@@ -7,7 +7,7 @@ from typing import Any
 # -- Auth --
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthResponse:
     token: str
     id: str
@@ -17,7 +17,7 @@ class AuthResponse:
     account_type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenPayload:
     subscription: bool
     id: str
@@ -30,19 +30,31 @@ class TokenPayload:
 # -- Proofread --
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedLanguage:
     iso: str
     label: str
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "iso": self.iso,
+            "label": self.label,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class ToneAnalysis:
     overall_tone: str
     description: str
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "overall_tone": self.overall_tone,
+            "description": self.description,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class WritingStatistics:
     word_count: int
     character_count: int
@@ -56,8 +68,23 @@ class WritingStatistics:
     reading_level: str
     readability_score: float
 
-
-@dataclass
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "word_count": self.word_count,
+            "character_count": self.character_count,
+            "character_count_no_spaces": self.character_count_no_spaces,
+            "paragraph_count": self.paragraph_count,
+            "sentence_count": self.sentence_count,
+            "average_words_per_sentence": self.average_words_per_sentence,
+            "average_characters_per_word": self.average_characters_per_word,
+            "vocabulary_diversity": self.vocabulary_diversity,
+            "reading_time_minutes": self.reading_time_minutes,
+            "reading_level": self.reading_level,
+            "readability_score": self.readability_score,
+        }
+
+
+@dataclass(slots=True)
 class ProofreadAnalysis:
     corrected_text: str
     changes: list[dict[str, Any]]
@@ -65,18 +92,37 @@ class ProofreadAnalysis:
     tone_analysis: ToneAnalysis
     writing_statistics: WritingStatistics
 
+    def to_dict(self) -> dict[str, Any]:
+        # ``changes`` is raw API data; it is shared, not copied.
+        return {
+            "corrected_text": self.corrected_text,
+            "changes": self.changes,
+            "corrections_summary": self.corrections_summary,
+            "tone_analysis": self.tone_analysis.to_dict(),
+            "writing_statistics": self.writing_statistics.to_dict(),
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class ProofreadResult:
     detected_language: DetectedLanguage | None
     text: str
     analysis: ProofreadAnalysis | None
 
+    def to_dict(self) -> dict[str, Any]:
+        language = self.detected_language
+        analysis = self.analysis
+        return {
+            "detected_language": language.to_dict() if language is not None else None,
+            "text": self.text,
+            "analysis": analysis.to_dict() if analysis is not None else None,
+        }
+
 
 # -- Summarizer --
 
 
-@dataclass
+@dataclass(slots=True)
 class WordStats:
     n_tokens: int
     n_words: int
@@ -84,8 +130,17 @@ class WordStats:
     time_saved: int
     length: int | None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "n_tokens": self.n_tokens,
+            "n_words": self.n_words,
+            "n_pages": self.n_pages,
+            "time_saved": self.time_saved,
+            "length": self.length,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ResponseMetadata:
     speed: float | None
     tokens: int
@@ -94,8 +149,18 @@ class ResponseMetadata:
     version: str
     cost: float
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "speed": self.speed,
+            "tokens": self.tokens,
+            "total_time_second": self.total_time_second,
+            "model": self.model,
+            "version": self.version,
+            "cost": self.cost,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class SummaryUpdate:
     output_text: str
     status: str
@@ -104,7 +169,7 @@ class SummaryUpdate:
     type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryResult:
     output_text: str
     markdown: str
@@ -114,11 +179,22 @@ class SummaryResult:
     elapsed_seconds: float | None
     title: str
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "output_text": self.output_text,
+            "markdown": self.markdown,
+            "status": self.status,
+            "word_stats": self.word_stats.to_dict(),
+            "response_metadata": self.response_metadata.to_dict(),
+            "elapsed_seconds": self.elapsed_seconds,
+            "title": self.title,
+        }
+
 
 # -- Assistant --
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantThread:
     id: str
     title: str
@@ -127,8 +203,18 @@ class AssistantThread:
     saved: bool
     shared: bool
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "saved": self.saved,
+            "shared": self.shared,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class AssistantMessage:
     id: str
     created_at: str
@@ -137,17 +223,49 @@ class AssistantMessage:
     reply: str | None
     md: str | None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "state": self.state,
+            "prompt": self.prompt,
+            "reply": self.reply,
+            "md": self.md,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class AssistantResult:
     thread: AssistantThread
     message: AssistantMessage
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "thread": self.thread.to_dict(),
+            "message": self.message.to_dict(),
+        }
+
+
+@dataclass(slots=True)
+class AssistantDelta:
+    """Change between two streamed HTML snapshots.
+
+    The new snapshot is the previous one truncated to ``start`` followed by
+    ``text``. Snapshots are rendered HTML, so closing tags can move and
+    ``start`` is not always the previous length.
+    """
+
+    start: int
+    text: str
+
+    def apply(self, snapshot: str) -> str:
+        return snapshot[: self.start] + self.text
+
 
 # -- Search --
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchInfo:
     share_url: str
     curr_batch: int
@@ -155,8 +273,17 @@ class SearchInfo:
     next_batch: int
     next_piece: int
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "share_url": self.share_url,
+            "curr_batch": self.curr_batch,
+            "curr_piece": self.curr_piece,
+            "next_batch": self.next_batch,
+            "next_piece": self.next_piece,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class DomainInfo:
     domain: str
     favicon_url: str | None
@@ -167,8 +294,20 @@ class DomainInfo:
     rule_type: str | None = None
     description: str | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "domain": self.domain,
+            "favicon_url": self.favicon_url,
+            "domain_secure": self.domain_secure,
+            "trackers": self.trackers,
+            "registration_date": self.registration_date,
+            "website_speed": self.website_speed,
+            "rule_type": self.rule_type,
+            "description": self.description,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class SearchItem:
     title: str
     url: str
@@ -176,10 +315,27 @@ class SearchItem:
     web_archive_url: str | None = None
     date: str | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "description": self.description,
+            "web_archive_url": self.web_archive_url,
+            "date": self.date,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class SearchResult:
     search_html: str
     info: SearchInfo
     items: list[SearchItem] = field(default_factory=list)
     domain_infos: list[DomainInfo] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "search_html": self.search_html,
+            "info": self.info.to_dict(),
+            "items": [item.to_dict() for item in self.items],
+            "domain_infos": [info.to_dict() for info in self.domain_infos],
+        }
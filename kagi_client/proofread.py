@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import json
 from collections.abc import AsyncIterator
 from typing import Any
 
 import httpx
 
+from kagi_client._json import loads
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
+from kagi_client.http import ServiceClient, borrow_http_client
 from kagi_client.models import (
     DetectedLanguage,
     ProofreadAnalysis,
@@ -15,14 +16,23 @@ from kagi_client.models import (
     ToneAnalysis,
     WritingStatistics,
 )
-from kagi_client.streams import parse_sse_events
+from kagi_client.streams import iter_sse_events
 
 PROOFREAD_URL = "https://translate.kagi.com/api/proofread"
+_HEADERS = {
+    "content-type": "application/json",
+    "referer": "https://translate.kagi.com/proofread",
+}
 
 
-class ProofreadClient:
-    def __init__(self, auth: KagiAuth) -> None:
+class ProofreadClient(ServiceClient):
+    def __init__(
+        self,
+        auth: KagiAuth,
+        http: httpx.AsyncClient | None = None,
+    ) -> None:
         self._auth = auth
+        self._http = http
 
     async def _request(
         self,
@@ -47,15 +57,11 @@ class ProofreadClient:
             "context": context,
             "explanation_language": "en",
         }
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with borrow_http_client(self._http) as client:
             resp = await client.post(
                 PROOFREAD_URL,
                 json=body,
-                headers={
-                    "content-type": "application/json",
-                    "referer": "https://translate.kagi.com/proofread",
-                },
+                headers=_HEADERS,
             )
         if resp.status_code != 200:
             raise APIError(
@@ -105,9 +111,8 @@ class ProofreadClient:
             context=context,
             model=model,
         )
-        events = parse_sse_events(resp.text)
-        for event in events:
-            yield json.loads(event.data)
+        for event in iter_sse_events(resp.text):
+            yield loads(event.data)
 
 
 def _parse_writing_stats(raw: dict[str, Any]) -> WritingStatistics:
@@ -127,19 +132,20 @@ def _parse_writing_stats(raw: dict[str, Any]) -> WritingStatistics:
 
 
 def _parse_proofread_response(response_text: str) -> ProofreadResult:
-    events = parse_sse_events(response_text)
     detected_language: DetectedLanguage | None = None
     text_parts: list[str] = []
     analysis: ProofreadAnalysis | None = None
 
-    for event in events:
-        data = json.loads(event.data)
+    for event in iter_sse_events(response_text):
+        data = loads(event.data)
 
-        if "detected_language" in data:
+        # Deltas make up nearly the whole stream; the other two arrive once.
+        delta = data.get("delta")
+        if delta is not None:
+            text_parts.append(delta)
+        elif "detected_language" in data:
             dl = data["detected_language"]
             detected_language = DetectedLanguage(iso=dl["iso"], label=dl["label"])
-        elif "delta" in data:
-            text_parts.append(data["delta"])
         elif "analysis" in data:
             a = data["analysis"]
             ta = a["tone_analysis"]
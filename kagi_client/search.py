@@ -1,93 +1,137 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import html as html_lib
 import re
 import secrets
+from collections import deque
 from collections.abc import AsyncIterator
-from html.parser import HTMLParser
 
 import httpx
 
+from kagi_client._json import JSONDecodeError, loads
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
+from kagi_client.http import ServiceClient, borrow_http_client
 from kagi_client.models import DomainInfo, SearchInfo, SearchItem, SearchResult
-from kagi_client.streams import parse_sse_events
+from kagi_client.streams import iter_sse_events
 
 SEARCH_URL = "https://kagi.com/socket/search"
 
+# Pages kept in flight by search_all. Kagi does not report a page count, so
+# later batches are fetched speculatively and discarded once a page reports
+# it is the last.
+PREFETCH_PAGES = 4
 
-class SearchClient:
-    def __init__(self, auth: KagiAuth) -> None:
+
+class SearchClient(ServiceClient):
+    def __init__(
+        self,
+        auth: KagiAuth,
+        http: httpx.AsyncClient | None = None,
+    ) -> None:
         self._auth = auth
+        self._http = http
 
-    async def _request(
+    async def _fetch(
         self,
+        client: httpx.AsyncClient,
         query: str,
         batch: int | None = None,
-    ) -> httpx.Response:
+    ) -> SearchResult:
         params: dict[str, str] = {"q": query}
         if batch is not None:
             params["batch"] = str(batch)
         else:
             params["nonce"] = secrets.token_hex(16)
 
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.get(
-                SEARCH_URL,
-                params=params,
-                cookies={"kagi_session": self._auth.kagi_session},
-                headers={
-                    "accept": "text/event-stream",
-                    "x-kagi-authorization": self._auth.kagi_session,
-                    "referer": f"https://kagi.com/search?q={query}",
-                },
-            )
+        resp = await client.get(
+            SEARCH_URL,
+            params=params,
+            headers={
+                "cookie": self._auth.session_cookie,
+                "accept": "text/event-stream",
+                "x-kagi-authorization": self._auth.kagi_session,
+                "referer": f"https://kagi.com/search?q={query}",
+            },
+        )
         if resp.status_code != 200:
             raise APIError(
                 f"Search request failed: {resp.status_code}",
                 status_code=resp.status_code,
                 body=resp.text,
             )
-        return resp
+        return _parse_search_response(resp.text)
 
     async def search(
         self,
         query: str,
         batch: int | None = None,
     ) -> SearchResult:
-        resp = await self._request(query, batch=batch)
-        return _parse_search_response(resp.text)
+        async with borrow_http_client(self._http) as client:
+            return await self._fetch(client, query, batch=batch)
 
     async def search_all(
         self,
         query: str,
+        prefetch: int = PREFETCH_PAGES,
     ) -> AsyncIterator[SearchResult]:
-        result = await self.search(query)
-        yield result
-        while result.info.next_batch > 0:
-            result = await self.search(query, batch=result.info.next_batch)
+        # Borrow once so every page reuses the same connection pool even
+        # when no client was injected.
+        async with borrow_http_client(self._http) as client:
+            result = await self._fetch(client, query)
             yield result
+            # Sliding window of speculative requests; window[0] is always the
+            # request for next_batch, and each page taken from the front is
+            # replaced by a request for the batch after the last in flight.
+            window: deque[asyncio.Task[SearchResult]] = deque()
+            try:
+                next_batch = result.info.next_batch
+                upcoming = next_batch
+                while next_batch > 0:
+                    while len(window) < max(prefetch, 1):
+                        window.append(
+                            asyncio.create_task(
+                                self._fetch(client, query, batch=upcoming)
+                            )
+                        )
+                        upcoming += 1
+                    batch = next_batch
+                    page = await window.popleft()
+                    yield page
+                    next_batch = page.info.next_batch
+                    if next_batch != batch + 1:
+                        # Last page (or a jump): requests past it are dropped,
+                        # along with any failures they hit.
+                        await _cancel_all(window)
+                        upcoming = next_batch
+            finally:
+                await _cancel_all(window)
+
+
+async def _cancel_all(tasks: deque[asyncio.Task[SearchResult]]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+
+
+# Tags, comments and declarations inside the small fragments captured below.
+# Quoted attribute values are skipped whole, since they may contain ">".
+_FRAGMENT_TAG_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<!\[CDATA\[.*?\]\]>"
+    r"|<[!?][^>]*>"
+    r"""|</?[a-zA-Z][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>""",
+    re.DOTALL,
+)
 
 
-class _TextExtractor(HTMLParser):
-    """Extract plain text from HTML, stripping all tags."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self._parts: list[str] = []
-
-    def handle_data(self, data: str) -> None:
-        self._parts.append(data)
-
-    def get_text(self) -> str:
-        return "".join(self._parts).strip()
-
-
-def _extract_text(html: str) -> str:
-    extractor = _TextExtractor()
-    extractor.feed(html)
-    return extractor.get_text()
+def _extract_text(fragment: str) -> str:
+    """Extract plain text from an HTML fragment, stripping all tags."""
+    if "<" in fragment or "&" in fragment:
+        fragment = html_lib.unescape(_FRAGMENT_TAG_RE.sub("", fragment))
+    return fragment.strip()
 
 
 # Split HTML into individual result blocks (each starts with _0_SRI class div)
@@ -122,32 +166,26 @@ def _parse_search_items(html: str) -> list[SearchItem]:
     """Parse search result HTML into structured SearchItem objects."""
     items: list[SearchItem] = []
 
-    # Find start positions of each result block
+    # Each block runs from one result start to the next; the field patterns
+    # search within those bounds instead of on sliced copies.
     starts = [m.start() for m in _RESULT_BLOCK_RE.finditer(html)]
-    if not starts:
-        return items
+    ends = starts[1:] + [len(html)]
 
-    # Split into blocks (each block runs from one start to the next)
-    blocks: list[str] = []
-    for i, start in enumerate(starts):
-        end = starts[i + 1] if i + 1 < len(starts) else len(html)
-        blocks.append(html[start:end])
-
-    for block in blocks:
-        title_m = _TITLE_LINK_RE.search(block)
+    for start, end in zip(starts, ends):
+        title_m = _TITLE_LINK_RE.search(html, start, end)
         if not title_m:
             continue
 
         url = title_m.group(1)
         title = _extract_text(title_m.group(2))
 
-        desc_m = _DESC_RE.search(block)
+        desc_m = _DESC_RE.search(html, start, end)
         description = _extract_text(desc_m.group(1)) if desc_m else ""
 
-        date_m = _DATE_RE.search(block)
+        date_m = _DATE_RE.search(html, start, end)
         date = _extract_text(date_m.group(1)) if date_m else None
 
-        archive_m = _ARCHIVE_RE.search(block)
+        archive_m = _ARCHIVE_RE.search(html, start, end)
         web_archive_url = archive_m.group(1) if archive_m else None
 
         items.append(
@@ -164,18 +202,18 @@ def _parse_search_items(html: str) -> list[SearchItem]:
 
 
 def _parse_search_response(response_text: str) -> SearchResult:
-    events = parse_sse_events(response_text)
-
     search_html_parts: list[str] = []
     info: SearchInfo | None = None
     domain_infos: list[DomainInfo] = []
 
-    for event in events:
+    # Events are decoded as the SSE text is split, so no list of events (each
+    # holding its own copy of the HTML) is kept alongside the shards.
+    for event in iter_sse_events(response_text):
         if not event.data or not event.data.strip():
             continue
         try:
-            items = json.loads(event.data)
-        except json.JSONDecodeError:
+            items = loads(event.data)
+        except JSONDecodeError:
             continue
 
         if not isinstance(items, list):
@@ -204,7 +242,7 @@ def _parse_search_response(response_text: str) -> SearchResult:
             elif tag == "domain_info":
                 raw = payload
                 if isinstance(raw, str):
-                    raw = json.loads(raw)
+                    raw = loads(raw)
                 if isinstance(raw, dict):
                     for d in raw.get("data", []):
                         domain_infos.append(
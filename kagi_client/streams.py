@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import re
+import string
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class SSEEvent:
     event: str | None
     data: str
     id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class KagiStreamLine:
     tag: str
     payload: str
@@ -19,48 +20,74 @@ class KagiStreamLine:
 
 def parse_sse_events(text: str) -> list[SSEEvent]:
     """Parse standard Server-Sent Events text into a list of SSEEvent objects."""
-    events: list[SSEEvent] = []
+    return list(iter_sse_events(text))
+
+
+def iter_sse_events(text: str) -> Iterator[SSEEvent]:
+    """Yield SSEEvent objects from Server-Sent Events text as they complete."""
     current_event: str | None = None
     current_data: list[str] = []
     current_id: str | None = None
 
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    # Events are only emitted at a blank line; without one there is nothing
+    # to yield, so skip splitting (e.g. a truncated or non-SSE body).
+    if "\n\n" not in text and not text.endswith("\n"):
+        return
+    # split("\n") rather than splitlines(): the latter also breaks on U+2028
+    # and friends, which may appear unescaped inside JSON payloads.
     for line in text.split("\n"):
-        if line == "":
+        if not line:
             # Empty line = event boundary
             if current_data:
-                events.append(
-                    SSEEvent(
-                        event=current_event,
-                        data="\n".join(current_data),
-                        id=current_id,
-                    )
+                yield SSEEvent(
+                    event=current_event,
+                    data="\n".join(current_data),
+                    id=current_id,
                 )
             current_event = None
             current_data = []
             current_id = None
-        elif line.startswith("event:"):
-            current_event = line[len("event:") :].strip()
-        elif line.startswith("data:"):
-            current_data.append(line[len("data:") :].strip())
-        elif line.startswith("id:"):
-            current_id = line[len("id:") :].strip()
+            continue
+        # Per the SSE spec a single space after the colon is not part of the
+        # value; the prefix lengths are "data:"=5, "event:"=6, "id:"=3.
+        first = line[0]
+        if first == "d" and line.startswith("data:"):
+            value = line[6:] if line[5:6] == " " else line[5:]
+            current_data.append(value)
+        elif first == "e" and line.startswith("event:"):
+            current_event = line[7:] if line[6:7] == " " else line[6:]
+        elif first == "i" and line.startswith("id:"):
+            current_id = line[4:] if line[3:4] == " " else line[3:]
         # Lines starting with ":" are comments -- skip
         # Other bare lines (like "hi") -- skip
 
-    return events
+
+# A Kagi stream tag line is "tag:payload" where tag is a word possibly with
+# dots/hyphens (e.g., "thread.json", "thread_list.html", "hi", "update",
+# "final", "tokens.json"). Checked by hand rather than with a regex, which
+# would also have to scan the (possibly large) payload.
+_TAG_HEAD_CHARS = frozenset(string.ascii_letters + "_")
+_TAG_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
 
 
-# Regex matching a Kagi stream tag line: "tag:payload" where tag is a word
-# possibly with dots/hyphens (e.g., "thread.json", "thread_list.html", "hi",
-# "update", "final", "tokens.json").
-_TAG_RE = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_.\-]*):(.*)$")
+def _split_tag(line: str) -> tuple[str, str] | None:
+    """Split a tag line into (tag, payload), or return None for other lines."""
+    i = line.find(":")
+    if i <= 0:
+        return None
+    tag = line[:i]
+    if tag[0] not in _TAG_HEAD_CHARS or not _TAG_CHARS.issuperset(tag):
+        return None
+    return tag, line[i + 1 :]
 
 
 def parse_kagi_stream_line(line: str) -> KagiStreamLine | None:
     """Parse a single Kagi stream line. Returns None if not a tag line."""
-    m = _TAG_RE.match(line.strip())
-    if m:
-        return KagiStreamLine(tag=m.group(1), payload=m.group(2))
+    split = _split_tag(line.strip())
+    if split is not None:
+        return KagiStreamLine(tag=split[0], payload=split[1])
     return None
 
 
@@ -71,34 +98,93 @@ def parse_kagi_stream_lines(text: str) -> list[KagiStreamLine]:
     A new tag line starts a new entry; continuation lines (not matching tag
     pattern) are appended to the current entry's payload.
     """
-    lines: list[KagiStreamLine] = []
-    raw_lines = text.split("\n")
-    i = 0
-
-    while i < len(raw_lines):
-        raw = raw_lines[i]
-        if raw.strip() == "":
-            i += 1
-            continue
+    return list(iter_kagi_stream_lines(text))
+
+
+def iter_kagi_stream_lines(text: str) -> Iterator[KagiStreamLine]:
+    """Yield KagiStreamLine entries from Kagi stream text as they complete."""
+    parser = KagiStreamParser()
+    for raw in text.split("\n"):
+        line = parser.feed(raw)
+        if line is not None:
+            yield line
+    last = parser.close()
+    if last is not None:
+        yield last
 
-        m = _TAG_RE.match(raw)
-        if m:
-            tag = m.group(1)
-            payload_parts = [m.group(2)]
-            i += 1
-            # Collect continuation lines (not a new tag, not blank before next tag)
-            while i < len(raw_lines):
-                next_line = raw_lines[i]
-                if next_line.strip() == "":
-                    i += 1
-                    continue
-                if _TAG_RE.match(next_line):
-                    break
-                payload_parts.append(next_line)
-                i += 1
-            payload = "\n".join(p for p in payload_parts if p.strip())
-            lines.append(KagiStreamLine(tag=tag, payload=payload))
-        else:
-            i += 1
-
-    return lines
+
+class KagiStreamParser:
+    """Incremental form of parse_kagi_stream_lines, fed one line at a time.
+
+    An entry is only complete once the next tag line (or the end of the
+    stream) shows that no continuation lines follow, so ``feed`` returns the
+    previous entry and ``close`` returns the last one.
+    """
+
+    def __init__(self) -> None:
+        self._tag: str | None = None
+        self._parts: list[str] = []
+
+    def feed(self, raw: str) -> KagiStreamLine | None:
+        if not raw.strip():
+            return None
+        split = _split_tag(raw)
+        if split is None:
+            # Continuation line; anything before the first tag is dropped.
+            if self._tag is not None:
+                self._parts.append(raw)
+            return None
+        done = self.close()
+        self._tag, first = split
+        if first.strip():
+            self._parts.append(first)
+        return done
+
+    def close(self) -> KagiStreamLine | None:
+        if self._tag is None:
+            return None
+        line = KagiStreamLine(tag=self._tag, payload="\n".join(self._parts))
+        self._tag = None
+        self._parts = []
+        return line
+
+
+async def aiter_stream_lines(chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Split streamed text into lines on "\n" only, like ``text.split("\n")``.
+
+    httpx's ``aiter_lines`` follows ``str.splitlines`` and would also break
+    JSON payloads on U+2028 and friends. Partial lines are kept as a list of
+    fragments and joined once their newline arrives.
+    """
+    pending: list[str] = []
+    async for chunk in chunks:
+        if "\n" not in chunk:
+            if chunk:
+                pending.append(chunk)
+            continue
+        lines = chunk.split("\n")
+        if pending:
+            pending.append(lines[0])
+            lines[0] = "".join(pending)
+            pending = []
+        tail = lines.pop()
+        for line in lines:
+            yield line
+        if tail:
+            pending.append(tail)
+    if pending:
+        yield "".join(pending)
+
+
+async def aiter_kagi_stream_lines(
+    chunks: AsyncIterable[str],
+) -> AsyncIterator[KagiStreamLine]:
+    """Parse Kagi stream entries from streamed text as it arrives."""
+    parser = KagiStreamParser()
+    async for raw in aiter_stream_lines(chunks):
+        line = parser.feed(raw)
+        if line is not None:
+            yield line
+    last = parser.close()
+    if last is not None:
+        yield last
@@ -1,35 +1,68 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
 import httpx
 
+from kagi_client._json import loads
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
+from kagi_client.http import ServiceClient, borrow_http_client
 from kagi_client.models import (
     ResponseMetadata,
     SummaryResult,
     SummaryUpdate,
     WordStats,
 )
-from kagi_client.streams import parse_kagi_stream_lines
+from kagi_client.streams import KagiStreamLine, aiter_kagi_stream_lines
 
 SUMMARIZER_URL = "https://kagi.com/mother/summary_labs"
+_HEADERS = {
+    "accept": "application/vnd.kagi.stream",
+    "referer": "https://kagi.com/summarizer",
+}
 
+# summarize() keeps this many recent results per client, each for this many
+# seconds; a size or TTL of 0 turns the cache off.
+SUMMARY_CACHE_SIZE = 128
+SUMMARY_CACHE_TTL = 300.0
 
-class SummarizerClient:
-    def __init__(self, auth: KagiAuth) -> None:
+
+class SummarizerClient(ServiceClient):
+    def __init__(
+        self,
+        auth: KagiAuth,
+        http: httpx.AsyncClient | None = None,
+        cache_size: int = SUMMARY_CACHE_SIZE,
+        cache_ttl: float = SUMMARY_CACHE_TTL,
+    ) -> None:
         self._auth = auth
+        self._http = http
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._cache: OrderedDict[tuple[str, str], tuple[float, SummaryResult]] = (
+            OrderedDict()
+        )
+        # Requests still running, so concurrent callers share one upstream call
+        self._pending: dict[tuple[str, str], asyncio.Future[SummaryResult]] = {}
 
-    async def _request(
+    @asynccontextmanager
+    async def _stream(
         self,
         url: str,
         summary_type: str = "takeaway",
-    ) -> httpx.Response:
-        timeout = httpx.Timeout(10.0, read=300.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.get(
+    ) -> AsyncIterator[AsyncIterator[KagiStreamLine]]:
+        """Open a streaming summary response and yield its parsed stream lines."""
+        async with (
+            borrow_http_client(self._http) as client,
+            client.stream(
+                "GET",
                 SUMMARIZER_URL,
                 params={
                     "url": url,
@@ -37,99 +70,137 @@ class SummarizerClient:
                     "target_language": "",
                     "summary_type": summary_type,
                 },
-                cookies={"kagi_session": self._auth.kagi_session},
-                headers={
-                    "accept": "application/vnd.kagi.stream",
-                    "referer": "https://kagi.com/summarizer",
-                },
-            )
-        if resp.status_code != 200:
-            raise APIError(
-                f"Summarizer request failed: {resp.status_code}",
-                status_code=resp.status_code,
-                body=resp.text,
-            )
-        return resp
+                headers={**_HEADERS, "cookie": self._auth.session_cookie},
+            ) as resp,
+        ):
+            if resp.status_code != 200:
+                await resp.aread()
+                raise APIError(
+                    f"Summarizer request failed: {resp.status_code}",
+                    status_code=resp.status_code,
+                    body=resp.text,
+                )
+            yield aiter_kagi_stream_lines(resp.aiter_text())
 
     async def summarize(
         self,
         url: str,
         summary_type: str = "takeaway",
     ) -> SummaryResult:
-        resp = await self._request(url, summary_type=summary_type)
-        return _parse_summary_response(resp.text)
+        if self._cache_size <= 0 or self._cache_ttl <= 0:
+            return await self._summarize(url, summary_type)
+        key = (url, summary_type)
+        cached = self._cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self._cache_ttl:
+                self._cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+            del self._cache[key]
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._summarize(url, summary_type))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda fut: self._store(key, fut))
+        # Shielded so one caller's cancellation doesn't fail the others.
+        result = await asyncio.shield(pending)
+        # Each caller gets its own copy; the cached result is never handed out.
+        return copy.deepcopy(result)
+
+    def _store(self, key: tuple[str, str], fut: asyncio.Future[SummaryResult]) -> None:
+        del self._pending[key]
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        self._cache[key] = (time.monotonic(), fut.result())
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def _summarize(self, url: str, summary_type: str) -> SummaryResult:
+        builder = _SummaryResultBuilder()
+        async with self._stream(url, summary_type=summary_type) as lines:
+            async for line in lines:
+                builder.feed(line)
+        return builder.build()
 
     async def summarize_stream(
         self,
         url: str,
         summary_type: str = "takeaway",
     ) -> AsyncIterator[SummaryUpdate]:
-        resp = await self._request(url, summary_type=summary_type)
-        lines = parse_kagi_stream_lines(resp.text)
-        for line in lines:
-            data = json.loads(line.payload)
-            od = data.get("output_data", {})
-            ws_raw = od.get("word_stats", {})
-            yield SummaryUpdate(
-                output_text=data.get("output_text", ""),
-                status=od.get("status", ""),
-                word_stats=WordStats(
-                    n_tokens=ws_raw.get("n_tokens", 0),
-                    n_words=ws_raw.get("n_words", 0),
-                    n_pages=ws_raw.get("n_pages", 0),
-                    time_saved=ws_raw.get("time_saved", 0),
-                    length=ws_raw.get("length"),
-                ),
-                tokens=data.get("tokens", 0),
-                type=data.get("type", "update"),
-            )
-
-
-def _parse_summary_response(response_text: str) -> SummaryResult:
-    lines = parse_kagi_stream_lines(response_text)
-    # Find the "final" line
-    final_data = None
-    for line in lines:
-        data = json.loads(line.payload)
-        if data.get("type") == "final":
-            final_data = data
-            break
-
-    if final_data is None:
-        # Fall back to last update
-        for line in reversed(lines):
-            data = json.loads(line.payload)
-            if data.get("output_data", {}).get("status") == "completed":
-                final_data = data
-                break
-
-    if final_data is None:
-        # Use the last line
-        final_data = json.loads(lines[-1].payload)
-
-    od = final_data.get("output_data", {})
-    ws_raw = od.get("word_stats", {})
-    rm_raw = od.get("response_metadata", {})
-
-    return SummaryResult(
-        output_text=final_data.get("output_text", ""),
-        markdown=od.get("markdown", ""),
+        async with self._stream(url, summary_type=summary_type) as lines:
+            async for line in lines:
+                yield _parse_summary_update(loads(line.payload))
+
+
+def _parse_word_stats(raw: dict[str, Any]) -> WordStats:
+    return WordStats(
+        n_tokens=raw.get("n_tokens", 0),
+        n_words=raw.get("n_words", 0),
+        n_pages=raw.get("n_pages", 0),
+        time_saved=raw.get("time_saved", 0),
+        length=raw.get("length"),
+    )
+
+
+def _parse_summary_update(data: dict[str, Any]) -> SummaryUpdate:
+    od = data.get("output_data", {})
+    return SummaryUpdate(
+        output_text=data.get("output_text", ""),
         status=od.get("status", ""),
-        word_stats=WordStats(
-            n_tokens=ws_raw.get("n_tokens", 0),
-            n_words=ws_raw.get("n_words", 0),
-            n_pages=ws_raw.get("n_pages", 0),
-            time_saved=ws_raw.get("time_saved", 0),
-            length=ws_raw.get("length"),
-        ),
-        response_metadata=ResponseMetadata(
-            speed=rm_raw.get("speed"),
-            tokens=rm_raw.get("tokens", 0),
-            total_time_second=rm_raw.get("total_time_second", 0),
-            model=rm_raw.get("model", ""),
-            version=rm_raw.get("version", ""),
-            cost=rm_raw.get("cost", 0),
-        ),
-        elapsed_seconds=od.get("elapsed_seconds"),
-        title=od.get("title", ""),
+        word_stats=_parse_word_stats(od.get("word_stats", {})),
+        tokens=data.get("tokens", 0),
+        type=data.get("type", "update"),
     )
+
+
+class _SummaryResultBuilder:
+    """Pick the summary to report from Kagi stream lines.
+
+    Prefers the first "final" line, then the last "completed" update, then
+    whatever line came last.
+    """
+
+    def __init__(self) -> None:
+        self._final: dict[str, Any] | None = None
+        self._completed: dict[str, Any] | None = None
+        self._last: KagiStreamLine | None = None
+
+    def feed(self, line: KagiStreamLine) -> None:
+        # Every update repeats the whole summary so far, so only lines that
+        # can be picked are decoded: the "final" tag, updates that mention
+        # "completed", and (in build) the last line as a fallback.
+        if self._final is not None:
+            return
+        self._last = line
+        if line.tag != "final" and '"completed"' not in line.payload:
+            return
+        data = loads(line.payload)
+        if data.get("type") == "final":
+            self._final = data
+        elif data.get("output_data", {}).get("status") == "completed":
+            self._completed = data
+
+    def build(self) -> SummaryResult:
+        final_data = self._final or self._completed
+        if final_data is None:
+            if self._last is None:
+                raise APIError("No summary found in response", status_code=200)
+            final_data = loads(self._last.payload)
+
+        od = final_data.get("output_data", {})
+        rm_raw = od.get("response_metadata", {})
+        return SummaryResult(
+            output_text=final_data.get("output_text", ""),
+            markdown=od.get("markdown", ""),
+            status=od.get("status", ""),
+            word_stats=_parse_word_stats(od.get("word_stats", {})),
+            response_metadata=ResponseMetadata(
+                speed=rm_raw.get("speed"),
+                tokens=rm_raw.get("tokens", 0),
+                total_time_second=rm_raw.get("total_time_second", 0),
+                model=rm_raw.get("model", ""),
+                version=rm_raw.get("version", ""),
+                cost=rm_raw.get("cost", 0),
+            ),
+            elapsed_seconds=od.get("elapsed_seconds"),
+            title=od.get("title", ""),
+        )
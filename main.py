@@ -11,20 +11,17 @@ async def main() -> None:
         return
 
     async with KagiClient(kagi_session=session) as client:
-        # Proofread
-        result = await client.proofread("Ths is a tset of the proofreading API.")
+        # The calls are independent, so run them concurrently over the
+        # client's shared connection pool.
+        result, summary, assistant, search = await asyncio.gather(
+            client.proofread("Ths is a tset of the proofreading API."),
+            client.summarize("https://example.com"),
+            client.prompt("What is 2+2?"),
+            client.search("python async"),
+        )
         print(f"Proofread: {result.analysis and result.analysis.corrected_text}")
-
-        # Summarize
-        summary = await client.summarize("https://example.com")
         print(f"Summary: {summary.title}")
-
-        # Assistant
-        assistant = await client.prompt("What is 2+2?")
         print(f"Assistant: {assistant.message.md}")
-
-        # Search
-        search = await client.search("python async")
         print(f"Search: {search.info.next_batch} more batches available")
 
 
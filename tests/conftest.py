@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
 
 import jwt
 import pytest
+import pytest_asyncio
 
+from kagi_client.client import KagiClient
 
 FAKE_KAGI_SESSION = "fakeSess_abc123.fakeSignature_xyz789"
 
+# Tokens are signed once per argument set; "valid" ones last 100 minutes from
+# the start of the session, far longer than the suite runs.
+_SESSION_START = int(time.time())
 
+
+@lru_cache(maxsize=32)
 def make_jwt_token(
     *,
     expired: bool = False,
@@ -16,7 +25,7 @@ def make_jwt_token(
     user_id: str = "123456",
     account_type: str = "professional",
 ) -> str:
-    now = int(time.time())
+    now = _SESSION_START
     if expired:
         iat = now - 7200
         exp = now - 3600
@@ -44,11 +53,25 @@ def fake_session() -> str:
     return FAKE_KAGI_SESSION
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_token() -> str:
     return make_jwt_token()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expired_token() -> str:
     return make_jwt_token(expired=True)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def kagi_client() -> AsyncIterator[KagiClient]:
+    """One KagiClient per module; creating its AsyncClient dominates setup.
+
+    Its summary cache is off so tests mocking different bodies for the same
+    URL stay independent. The auth token is kept between tests, so tests
+    that exercise the auth refresh should open their own client.
+    """
+    async with KagiClient(
+        kagi_session=FAKE_KAGI_SESSION, summary_cache_size=0
+    ) as client:
+        yield client
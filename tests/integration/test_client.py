@@ -2,6 +2,7 @@ from __future__ import annotations
 
 
 import httpx
+import pytest
 import respx
 
 from kagi_client.client import KagiClient
@@ -13,6 +14,9 @@ from kagi_client.models import (
 )
 from tests.conftest import FAKE_KAGI_SESSION, make_jwt_token
 
+# Share the module-scoped kagi_client fixture's event loop.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 AUTH_URL = "https://translate.kagi.com/api/auth"
 PROOFREAD_URL = "https://translate.kagi.com/api/proofread"
 SUMMARIZER_URL = "https://kagi.com/mother/summary_labs"
@@ -98,6 +102,7 @@ class TestKagiClient:
 
     @respx.mock
     async def test_proofread(self) -> None:
+        # Own client: the shared fixture may already hold a token.
         _mock_auth()
         respx.post(PROOFREAD_URL).mock(
             return_value=httpx.Response(200, text=PROOFREAD_SSE)
@@ -106,34 +111,88 @@ class TestKagiClient:
             result = await client.proofread("test")
         assert isinstance(result, ProofreadResult)
         assert result.text == "test"
+        assert respx.calls.call_count == 2
 
     @respx.mock
-    async def test_summarize(self) -> None:
+    async def test_summarize(self, kagi_client: KagiClient) -> None:
         _mock_auth()
         respx.get(SUMMARIZER_URL).mock(
             return_value=httpx.Response(200, text=SUMMARIZER_STREAM)
         )
-        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
-            result = await client.summarize("https://example.com")
+        result = await kagi_client.summarize("https://example.com")
         assert isinstance(result, SummaryResult)
         assert result.title == "Test"
 
     @respx.mock
-    async def test_assistant(self) -> None:
+    async def test_summary_cache_can_be_disabled(self) -> None:
+        _mock_auth()
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=SUMMARIZER_STREAM)
+        )
+        async with KagiClient(
+            kagi_session=FAKE_KAGI_SESSION, summary_cache_size=0
+        ) as client:
+            await client.summarize("https://example.com")
+            await client.summarize("https://example.com")
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_assistant(self, kagi_client: KagiClient) -> None:
         _mock_auth()
         respx.post(ASSISTANT_URL).mock(
             return_value=httpx.Response(200, text=ASSISTANT_STREAM)
         )
-        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
-            result = await client.prompt("Hi")
+        result = await kagi_client.prompt("Hi")
         assert isinstance(result, AssistantResult)
         assert result.message.md == "Hello"
 
     @respx.mock
-    async def test_search(self) -> None:
+    async def test_search(self, kagi_client: KagiClient) -> None:
         _mock_auth()
         respx.get(SEARCH_URL).mock(return_value=httpx.Response(200, text=SEARCH_SSE))
-        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
-            result = await client.search("test")
+        result = await kagi_client.search("test")
         assert isinstance(result, SearchResult)
         assert "Result" in result.search_html
+
+    @respx.mock
+    async def test_services_share_one_http_client(self) -> None:
+        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
+            http = client._http
+            assert client._auth._http is http
+            assert client._proofread._http is http
+            assert client._summarizer._http is http
+            assert client._assistant._http is http
+            assert client._search._http is http
+            assert not http.is_closed
+        assert http.is_closed
+
+    @respx.mock
+    async def test_sequential_requests_reuse_http_client(self) -> None:
+        _mock_auth()
+        respx.get(SEARCH_URL).mock(return_value=httpx.Response(200, text=SEARCH_SSE))
+        respx.post(ASSISTANT_URL).mock(
+            return_value=httpx.Response(200, text=ASSISTANT_STREAM)
+        )
+        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
+            await client.search("test")
+            await client.prompt("Hi")
+            await client.search("test")
+            assert not client._http.is_closed
+
+    @respx.mock
+    async def test_set_cookie_is_not_replayed_to_other_services(self) -> None:
+        respx.get(SEARCH_URL).mock(
+            return_value=httpx.Response(
+                200,
+                text=SEARCH_SSE,
+                headers={"set-cookie": "tracker=1; Domain=kagi.com; Path=/"},
+            )
+        )
+        route = respx.post(ASSISTANT_URL).mock(
+            return_value=httpx.Response(200, text=ASSISTANT_STREAM)
+        )
+        async with KagiClient(kagi_session=FAKE_KAGI_SESSION) as client:
+            await client.search("test")
+            await client.prompt("Hi")
+        cookie = route.calls.last.request.headers["cookie"]
+        assert cookie == f"kagi_session={FAKE_KAGI_SESSION}"
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import json
 
 import httpx
 import pytest
 import respx
 
-from kagi_client.assistant import AssistantClient
+from kagi_client.assistant import AssistantClient, _common_prefix_len, _parse_json
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
 from kagi_client.models import AssistantResult
@@ -66,6 +67,31 @@ class TestAssistantClient:
         result = await client.prompt("Hello", model="claude-4-sonnet")
         assert isinstance(result, AssistantResult)
 
+    @respx.mock
+    async def test_prompt_request_body(self) -> None:
+        route = respx.post(ASSISTANT_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        client = AssistantClient(auth=_make_auth())
+        await client.prompt("Héllo", model="m", thread_id="t-1", internet_access=False)
+        request = route.calls.last.request
+        assert request.headers["content-type"] == "application/json"
+        assert json.loads(request.content) == {
+            "focus": {
+                "thread_id": "t-1",
+                "branch_id": "00000000-0000-4000-0000-000000000000",
+                "prompt": "Héllo",
+            },
+            "profile": {
+                "id": None,
+                "personalizations": True,
+                "internet_access": False,
+                "model": "m",
+                "lens_id": None,
+            },
+            "threads": [{"tag_ids": [], "saved": False, "shared": False}],
+        }
+
     @respx.mock
     async def test_prompt_raises_on_http_error(self) -> None:
         respx.post(ASSISTANT_URL).mock(
@@ -77,6 +103,24 @@ class TestAssistantClient:
             await client.prompt("Hello")
         assert exc_info.value.status_code == 401
 
+    @respx.mock
+    async def test_prompt_raises_without_thread(self) -> None:
+        respx.post(ASSISTANT_URL).mock(
+            return_value=httpx.Response(200, text='hi:{"v":"1"}\n')
+        )
+        client = AssistantClient(auth=_make_auth())
+        with pytest.raises(APIError, match="thread.json"):
+            await client.prompt("Hello")
+
+    @respx.mock
+    async def test_prompt_error_body_keeps_stream_tail(self) -> None:
+        body = 'hi:{"v":"1"}\nthread.json:{"id":"t","title":"x","created_at":""}\n'
+        respx.post(ASSISTANT_URL).mock(return_value=httpx.Response(200, text=body))
+        client = AssistantClient(auth=_make_auth())
+        with pytest.raises(APIError, match="new_message.json") as exc_info:
+            await client.prompt("Hello")
+        assert exc_info.value.body == body.rstrip("\n")
+
     @respx.mock
     async def test_prompt_stream(self) -> None:
         respx.post(ASSISTANT_URL).mock(
@@ -89,3 +133,59 @@ class TestAssistantClient:
             tokens.append(token)
         # Should yield token text from tokens.json lines
         assert any(t == "<p>Hi there!</p>" for t in tokens)
+
+    @respx.mock
+    async def test_prompt_keeps_line_separator_in_payload(self) -> None:
+        text = KAGI_STREAM_RESPONSE.replace("Hi there!", "Hi\u2028there!")
+        respx.post(ASSISTANT_URL).mock(return_value=httpx.Response(200, text=text))
+        client = AssistantClient(auth=_make_auth())
+        result = await client.prompt("Hello")
+        assert result.message.reply == "<p>Hi\u2028there!</p>"
+        tokens = [t async for t in client.prompt_stream("Hello")]
+        assert tokens[-1] == "<p>Hi\u2028there!</p>"
+
+    @respx.mock
+    async def test_prompt_stream_deltas_rebuild_snapshots(self) -> None:
+        body = (
+            'tokens.json:{"text":"<p>Hi</p>","id":"msg-1"}\n'
+            'tokens.json:{"text":"<p>Hi there</p>","id":"msg-1"}\n'
+            'tokens.json:{"text":"<p>Hi there</p><p>Bye</p>","id":"msg-1"}\n'
+        )
+        respx.post(ASSISTANT_URL).mock(return_value=httpx.Response(200, text=body))
+        client = AssistantClient(auth=_make_auth())
+        deltas = [d async for d in client.prompt_stream_deltas("Hello")]
+        assert [(d.start, d.text) for d in deltas] == [
+            (0, "<p>Hi</p>"),
+            (5, " there</p>"),
+            (15, "<p>Bye</p>"),
+        ]
+        snapshot = ""
+        for delta in deltas:
+            snapshot = delta.apply(snapshot)
+        assert snapshot == "<p>Hi there</p><p>Bye</p>"
+
+
+class TestCommonPrefixLen:
+    def test_extension(self) -> None:
+        assert _common_prefix_len("<p>Hi", "<p>Hi there") == 5
+
+    def test_rewrite(self) -> None:
+        assert _common_prefix_len("<p>Hi</p>", "<p>Hi there</p>") == 5
+
+    def test_disjoint(self) -> None:
+        assert _common_prefix_len("abc", "xyz") == 0
+
+
+class TestParseJson:
+    def test_parses_object(self) -> None:
+        assert _parse_json('{"text":"hi","id":"1"}') == {"text": "hi", "id": "1"}
+
+    def test_tolerates_surrounding_whitespace(self) -> None:
+        assert _parse_json('  {"a":1}\n') == {"a": 1}
+
+    def test_ignores_trailing_data(self) -> None:
+        assert _parse_json('{"a":1}{"b":2}') == {"a": 1}
+
+    def test_raises_on_invalid_json(self) -> None:
+        with pytest.raises(ValueError):
+            _parse_json("not json")
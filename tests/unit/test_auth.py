@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import time
+from unittest.mock import patch
 
 import httpx
 import pytest
 import respx
 
+from kagi_client._json import loads
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import AuthError
 from kagi_client.models import TokenPayload
@@ -27,6 +30,12 @@ class TestDecodeToken:
         payload = auth.decode_token(expired_token)
         assert payload.exp < int(time.time())
 
+    @pytest.mark.parametrize("token", ["not-a-jwt", "a.!!!.c", "a.bm90IGpzb24.c"])
+    def test_malformed_token_raises(self, token: str) -> None:
+        auth = KagiAuth(kagi_session="fake")
+        with pytest.raises(AuthError, match="Malformed token"):
+            auth.decode_token(token)
+
 
 class TestIsTokenExpired:
     def test_valid_token_not_expired(self, valid_token: str) -> None:
@@ -37,6 +46,28 @@ class TestIsTokenExpired:
         auth = KagiAuth(kagi_session="fake")
         assert auth.is_token_expired(expired_token) is True
 
+    def test_decodes_each_token_once(self, valid_token: str) -> None:
+        auth = KagiAuth(kagi_session="fake")
+        with patch("kagi_client.auth.loads", wraps=loads) as spy:
+            for _ in range(3):
+                assert auth.is_token_expired(valid_token) is False
+        assert spy.call_count == 1
+
+    def test_decode_token_returns_cached_payload(self, valid_token: str) -> None:
+        auth = KagiAuth(kagi_session="fake")
+        assert auth.decode_token(valid_token) is auth.decode_token(valid_token)
+
+    def test_new_token_is_decoded(self, valid_token: str, expired_token: str) -> None:
+        auth = KagiAuth(kagi_session="fake")
+        assert auth.is_token_expired(valid_token) is False
+        assert auth.is_token_expired(expired_token) is True
+
+    def test_token_within_leeway_is_expired(self) -> None:
+        auth = KagiAuth(kagi_session="fake")
+        with patch.object(auth, "decode_token") as decode:
+            decode.return_value.exp = int(time.time()) + 1
+            assert auth.is_token_expired("token") is True
+
 
 class TestRefreshToken:
     @respx.mock
@@ -118,3 +149,32 @@ class TestGetValidToken:
         auth = KagiAuth(kagi_session=fake_session)
         result = await auth.get_valid_token()
         assert result == new_token
+
+    @respx.mock
+    async def test_concurrent_callers_share_one_refresh(
+        self, fake_session: str
+    ) -> None:
+        new_token = make_jwt_token()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            # Yield so every caller reaches get_valid_token before a token lands
+            await asyncio.sleep(0)
+            return httpx.Response(
+                200,
+                json={
+                    "token": new_token,
+                    "id": "123",
+                    "loggedIn": True,
+                    "subscription": True,
+                    "expiresAt": "2025-09-29T14:52:13.000Z",
+                    "accountType": "professional",
+                },
+            )
+
+        route = respx.get("https://translate.kagi.com/api/auth").mock(
+            side_effect=respond
+        )
+        auth = KagiAuth(kagi_session=fake_session)
+        tokens = await asyncio.gather(*(auth.get_valid_token() for _ in range(4)))
+        assert tokens == [new_token] * 4
+        assert route.call_count == 1
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 import io
 import json
+from collections.abc import Iterator
 from importlib import metadata as importlib_metadata
+from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
+from kagi_client._version import resolve_version
+from kagi_client.cli import (
+    _run_async,
+    _split_thinking,
+    app,
+    html_to_markdown,
+    strip_html,
+)
 from kagi_client.models import (
     AssistantMessage,
     AssistantResult,
@@ -30,12 +42,6 @@ from kagi_client.models import (
 runner = CliRunner()
 
 
-def _import_app():
-    from kagi_client.cli import app
-
-    return app
-
-
 def _make_proofread_result() -> ProofreadResult:
     return ProofreadResult(
         detected_language=DetectedLanguage(iso="en", label="English"),
@@ -157,29 +163,17 @@ def _mock_client(**method_results: Any) -> AsyncMock:
 
 
 class TestNoSession:
-    def test_proofread_no_session(self) -> None:
-        app = _import_app()
-        result = runner.invoke(app, ["proofread", "hello"], env={"KAGI_SESSION": ""})
-        assert result.exit_code != 0
-        assert "KAGI_SESSION" in result.output
-
-    def test_summarize_no_session(self) -> None:
-        app = _import_app()
-        result = runner.invoke(
-            app, ["summarize", "https://example.com"], env={"KAGI_SESSION": ""}
-        )
-        assert result.exit_code != 0
-        assert "KAGI_SESSION" in result.output
-
-    def test_ask_no_session(self) -> None:
-        app = _import_app()
-        result = runner.invoke(app, ["ask", "hello"], env={"KAGI_SESSION": ""})
-        assert result.exit_code != 0
-        assert "KAGI_SESSION" in result.output
-
-    def test_search_no_session(self) -> None:
-        app = _import_app()
-        result = runner.invoke(app, ["search", "test query"], env={"KAGI_SESSION": ""})
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["proofread", "hello"],
+            ["summarize", "https://example.com"],
+            ["ask", "hello"],
+            ["search", "test query"],
+        ],
+    )
+    def test_requires_session(self, argv: list[str]) -> None:
+        result = runner.invoke(app, argv, env={"KAGI_SESSION": ""})
         assert result.exit_code != 0
         assert "KAGI_SESSION" in result.output
 
@@ -191,7 +185,6 @@ class TestProofreadCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_basic(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["proofread", "hello world"], env={"KAGI_SESSION": "fake"}
         )
@@ -201,7 +194,6 @@ class TestProofreadCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_stdin(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["proofread", "-"], input="hello world", env={"KAGI_SESSION": "fake"}
         )
@@ -212,7 +204,6 @@ class TestProofreadCommand:
     def test_options_forwarding(self, mock_cls: Any) -> None:
         mock = _mock_client(proofread=_make_proofread_result())
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(
             app,
             [
@@ -247,7 +238,6 @@ class TestProofreadCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_statistics_display(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["proofread", "hello world"], env={"KAGI_SESSION": "fake"}
         )
@@ -263,7 +253,6 @@ class TestSummarizeCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_basic(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(summarize=_make_summary_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["summarize", "https://example.com"],
@@ -276,7 +265,6 @@ class TestSummarizeCommand:
     def test_type_option(self, mock_cls: Any) -> None:
         mock = _mock_client(summarize=_make_summary_result())
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(
             app,
             ["summarize", "https://example.com", "--type", "summary"],
@@ -304,7 +292,6 @@ class TestAskCommand:
             )
         )
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(app, ["ask", "hello"], env={"KAGI_SESSION": "fake"})
         assert result.exit_code == 0
         assert "Hello! How can I help?" in result.output
@@ -321,7 +308,6 @@ class TestAskCommand:
             )
         )
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(
             app, ["ask", "-"], input="hello", env={"KAGI_SESSION": "fake"}
         )
@@ -335,7 +321,6 @@ class TestAskCommand:
             return_value=_async_iter(["<details><p>T</p></details><p>response</p>"])
         )
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(
             app,
             [
@@ -376,12 +361,52 @@ class TestAskCommand:
             )
         )
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(app, ["ask", "hello"], env={"KAGI_SESSION": "fake"})
         assert result.exit_code == 0
         assert "Hmm" in result.output
         assert "Hello world" in result.output
 
+    @patch("kagi_client.cli.KagiClient")
+    def test_progress_dots(self, mock_cls: Any) -> None:
+        thinking = "<details><summary>Thinking</summary><p>Hmm</p></details>"
+        mock = _mock_client()
+        mock.prompt_stream = MagicMock(
+            return_value=_async_iter(
+                [thinking + "<p>Hel</p>", thinking + "<p>Hello world</p>"]
+            )
+        )
+        mock_cls.return_value = mock
+        result = runner.invoke(
+            app, ["ask", "hello", "--progress"], env={"KAGI_SESSION": "fake"}
+        )
+        assert result.exit_code == 0
+        assert result.stderr == "..\n"
+        assert "Hello world" in result.stdout
+
+    @patch("kagi_client.cli.KagiClient")
+    def test_thinking_stripped_once(self, mock_cls: Any) -> None:
+        """The thinking block is parsed once, not on every snapshot."""
+        thinking = "<details><summary>Thinking</summary><p>Hmm</p></details>"
+        mock = _mock_client()
+        mock.prompt_stream = MagicMock(
+            return_value=_async_iter(
+                [
+                    "<details><summary>Thinking</summary><p>Hm",
+                    thinking + "<p>Hel</p>",
+                    thinking + "<p>Hello</p>",
+                    thinking + "<p>Hello world</p>",
+                ]
+            )
+        )
+        mock_cls.return_value = mock
+        from kagi_client import cli
+
+        with patch("kagi_client.cli.strip_html", wraps=cli.strip_html) as spy:
+            result = runner.invoke(app, ["ask", "hello"], env={"KAGI_SESSION": "fake"})
+        assert result.exit_code == 0
+        assert spy.call_count == 1
+        assert "Hello world" in result.output
+
     @patch("kagi_client.cli.KagiClient")
     def test_code_blocks_preserved(self, mock_cls: Any) -> None:
         """Code blocks should render properly in console output."""
@@ -399,7 +424,6 @@ class TestAskCommand:
             )
         )
         mock_cls.return_value = mock
-        app = _import_app()
         result = runner.invoke(app, ["ask", "hello"], env={"KAGI_SESSION": "fake"})
         assert result.exit_code == 0
         assert "cat file.txt | xargs echo" in result.output
@@ -414,7 +438,6 @@ class TestSearchCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_basic(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["search", "test query"], env={"KAGI_SESSION": "fake"}
         )
@@ -426,7 +449,6 @@ class TestSearchCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_description_and_archive(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["search", "test query"], env={"KAGI_SESSION": "fake"}
         )
@@ -437,26 +459,36 @@ class TestSearchCommand:
     @patch("kagi_client.cli.KagiClient")
     def test_domain_table(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app, ["search", "test query"], env={"KAGI_SESSION": "fake"}
         )
         assert result.exit_code == 0
         assert "example.com" in result.output
 
+    @patch("kagi_client.cli.KagiClient")
+    def test_all_pages_without_items_show_plain_text(self, mock_cls: Any) -> None:
+        first, second = _make_search_result(), _make_search_result()
+        first.items = []
+        second.items = []
+        second.search_html = "<div>Result <i>2</i></div>"
+        mock = _mock_client()
+        mock.search_all = MagicMock(return_value=_async_iter([first, second]))
+        mock_cls.return_value = mock
+        result = runner.invoke(
+            app, ["search", "test query", "--all"], env={"KAGI_SESSION": "fake"}
+        )
+        assert result.exit_code == 0
+        assert result.output.index("Result 1") < result.output.index("Result 2")
+
 
 # -- Thinking split tests --
 
 
 class TestSplitThinking:
     def test_no_thinking_block(self) -> None:
-        from kagi_client.cli import _split_thinking
-
         assert _split_thinking("<p>Hello</p>") == ("", "")
 
     def test_with_thinking_block(self) -> None:
-        from kagi_client.cli import _split_thinking
-
         thinking, response = _split_thinking(
             "<details><summary>Thinking</summary><p>Hmm</p></details><p>Answer</p>"
         )
@@ -464,13 +496,9 @@ class TestSplitThinking:
         assert response == "<p>Answer</p>"
 
     def test_incomplete_thinking(self) -> None:
-        from kagi_client.cli import _split_thinking
-
         assert _split_thinking("<details><p>Thinking...") == ("", "")
 
     def test_empty_response_after_thinking(self) -> None:
-        from kagi_client.cli import _split_thinking
-
         thinking, response = _split_thinking("<details><p>Done</p></details>")
         assert thinking == "Done"
         assert response == ""
@@ -481,33 +509,26 @@ class TestSplitThinking:
 
 class TestHTMLStripping:
     def test_simple_tags(self) -> None:
-        from kagi_client.cli import strip_html
-
         assert strip_html("<b>bold</b> text") == "bold text"
 
     def test_nested_tags(self) -> None:
-        from kagi_client.cli import strip_html
-
         assert strip_html("<div><p>nested <b>bold</b></p></div>") == "nested bold"
 
     def test_empty_string(self) -> None:
-        from kagi_client.cli import strip_html
-
         assert strip_html("") == ""
 
     def test_plain_text(self) -> None:
-        from kagi_client.cli import strip_html
-
         assert strip_html("no tags here") == "no tags here"
 
+    def test_entities_without_tags(self) -> None:
+        assert strip_html("fish &amp; chips") == "fish & chips"
+
 
 # -- HTML to Markdown tests --
 
 
 class TestHTMLToMarkdown:
     def test_code_block(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = '<pre><code class="language-bash">echo hello</code></pre>'
         result = html_to_markdown(html)
         assert "```bash" in result
@@ -515,16 +536,12 @@ class TestHTMLToMarkdown:
         assert result.strip().endswith("```")
 
     def test_code_block_no_language(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<pre><code>x = 1</code></pre>"
         result = html_to_markdown(html)
         assert "```" in result
         assert "x = 1" in result
 
     def test_paragraphs(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<p>First paragraph</p><p>Second paragraph</p>"
         result = html_to_markdown(html)
         assert "First paragraph" in result
@@ -532,25 +549,23 @@ class TestHTMLToMarkdown:
         # Paragraphs should be separated by blank line
         assert "First paragraph\n\nSecond paragraph" in result
 
-    def test_headers(self) -> None:
-        from kagi_client.cli import html_to_markdown
+    def test_blank_line_not_doubled_after_break(self) -> None:
+        html = "Line<br><p>Para</p><h2>Title</h2>"
+        assert html_to_markdown(html) == "Line\n\nPara\n\n## Title"
 
+    def test_headers(self) -> None:
         html = "<h2>Title</h2><p>Content</p>"
         result = html_to_markdown(html)
         assert "## Title" in result
         assert "Content" in result
 
     def test_list_items(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<ul><li>First</li><li>Second</li></ul>"
         result = html_to_markdown(html)
         assert "- First" in result
         assert "- Second" in result
 
     def test_mixed_content(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = (
             "<p>Use this command:</p>"
             '<pre><code class="language-bash">cat file.txt | xargs echo</code></pre>'
@@ -563,36 +578,29 @@ class TestHTMLToMarkdown:
         assert "That will print each line." in result
 
     def test_plain_text(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         assert html_to_markdown("no tags") == "no tags"
 
-    def test_preserves_code_content(self) -> None:
-        from kagi_client.cli import html_to_markdown
+    def test_plain_text_is_stripped(self) -> None:
+        assert html_to_markdown("  no tags\n") == "no tags"
 
+    def test_preserves_code_content(self) -> None:
         html = '<pre><code class="language-python">if x > 0:\n    print(x)</code></pre>'
         result = html_to_markdown(html)
         assert "if x > 0:" in result
         assert "    print(x)" in result
 
     def test_bold_and_italic(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<p>This is <strong>bold</strong> and <em>italic</em>.</p>"
         result = html_to_markdown(html)
         assert "**bold**" in result
         assert "*italic*" in result
 
     def test_inline_code(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<p>Use <code>-t</code> flag.</p>"
         result = html_to_markdown(html)
         assert "`-t`" in result
 
     def test_no_excess_blank_lines(self) -> None:
-        from kagi_client.cli import html_to_markdown
-
         html = "<p>One</p>\n\n<p>Two</p>\n\n<p>Three</p>"
         result = html_to_markdown(html)
         # Should not have more than 2 consecutive newlines
@@ -604,7 +612,6 @@ class TestHTMLToMarkdown:
 
 class TestHelp:
     def test_no_args_shows_help(self) -> None:
-        app = _import_app()
         result = runner.invoke(app, [])
         assert "proofread" in result.output
         assert "summarize" in result.output
@@ -612,43 +619,82 @@ class TestHelp:
         assert "search" in result.output
 
     def test_help_flag(self) -> None:
-        app = _import_app()
         result = runner.invoke(app, ["--help"])
         assert result.exit_code == 0
         assert "proofread" in result.output
 
 
 class TestVersion:
-    @patch("kagi_client.cli.subprocess.run")
+    @pytest.fixture(autouse=True)
+    def _clear_version_cache(self) -> Iterator[None]:
+        resolve_version.cache_clear()
+        yield
+        resolve_version.cache_clear()
+
+    @patch("kagi_client._version.subprocess.run")
     def test_uses_git_exact_tag(self, mock_run: Any) -> None:
-        mock_run.return_value = MagicMock(stdout="v1.2.3\n")
-        app = _import_app()
-        result = runner.invoke(app, ["--version"])
+        mock_run.return_value = SimpleNamespace(stdout="v1.2.3\n")
+        result = runner.invoke(app, ["--version"], env={"KAGI_DEV": "1"})
         assert result.exit_code == 0
         assert result.output.strip() == "v1.2.3"
 
-    @patch("kagi_client.cli.metadata.version")
-    @patch("kagi_client.cli.subprocess.run", side_effect=OSError)
+    @patch("kagi_client._version.metadata.version")
+    @patch("kagi_client._version.subprocess.run")
+    def test_skips_git_outside_dev(self, mock_run: Any, mock_version: Any) -> None:
+        mock_version.return_value = "1.2.4"
+        result = runner.invoke(app, ["--version"], env={"KAGI_DEV": ""})
+        assert result.exit_code == 0
+        assert result.output.strip() == "1.2.4"
+        mock_run.assert_not_called()
+
+    @patch("kagi_client._version.metadata.version")
+    @patch("kagi_client._version.subprocess.run", side_effect=OSError)
     def test_falls_back_to_package_metadata(
         self, _mock_run: Any, mock_version: Any
     ) -> None:
         mock_version.return_value = "1.2.4"
-        app = _import_app()
-        result = runner.invoke(app, ["--version"])
+        result = runner.invoke(app, ["--version"], env={"KAGI_DEV": "1"})
         assert result.exit_code == 0
         assert result.output.strip() == "1.2.4"
 
-    @patch("kagi_client.cli.metadata.version")
-    @patch("kagi_client.cli.subprocess.run", side_effect=OSError)
+    @patch("kagi_client._version.metadata.version")
+    @patch("kagi_client._version.subprocess.run", side_effect=OSError)
     def test_unknown_when_no_git_and_no_package_metadata(
         self, _mock_run: Any, mock_version: Any
     ) -> None:
         mock_version.side_effect = importlib_metadata.PackageNotFoundError
-        app = _import_app()
-        result = runner.invoke(app, ["--version"])
+        result = runner.invoke(app, ["--version"], env={"KAGI_DEV": "1"})
         assert result.exit_code == 0
         assert result.output.strip() == "0.0.0+unknown"
 
+    @patch("kagi_client._version.metadata.version")
+    def test_resolved_once_per_process(self, mock_version: Any) -> None:
+        mock_version.return_value = "1.2.4"
+        assert resolve_version() == resolve_version() == "1.2.4"
+        assert mock_version.call_count == 1
+
+
+class TestRunAsync:
+    def test_runs_without_uvloop(self) -> None:
+        loops = []
+
+        async def _run() -> None:
+            loops.append(type(asyncio.get_running_loop()).__module__)
+
+        with patch.dict("sys.modules", {"uvloop": None}):
+            _run_async(_run())
+        assert loops[0].startswith("asyncio.")
+
+    def test_uses_uvloop_when_installed(self) -> None:
+        pytest.importorskip("uvloop")
+        loops = []
+
+        async def _run() -> None:
+            loops.append(type(asyncio.get_running_loop()).__module__)
+
+        _run_async(_run())
+        assert loops == ["uvloop"]
+
 
 # -- Format option tests --
 
@@ -657,7 +703,6 @@ class TestProofreadFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_json(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["proofread", "hello world", "--format", "json"],
@@ -671,7 +716,6 @@ class TestProofreadFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_md(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["proofread", "hello world", "--format", "md"],
@@ -684,7 +728,6 @@ class TestProofreadFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_csv(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(proofread=_make_proofread_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["proofread", "hello world", "--format", "csv"],
@@ -700,7 +743,6 @@ class TestSummarizeFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_json(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(summarize=_make_summary_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["summarize", "https://example.com", "--format", "json"],
@@ -713,7 +755,6 @@ class TestSummarizeFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_md(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(summarize=_make_summary_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["summarize", "https://example.com", "--format", "md"],
@@ -726,7 +767,6 @@ class TestSummarizeFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_csv(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(summarize=_make_summary_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["summarize", "https://example.com", "--format", "csv"],
@@ -742,7 +782,6 @@ class TestAskFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_json(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(prompt=_make_assistant_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["ask", "hello", "--format", "json"],
@@ -756,7 +795,6 @@ class TestAskFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_md(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(prompt=_make_assistant_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["ask", "hello", "--format", "md"],
@@ -768,7 +806,6 @@ class TestAskFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_csv(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(prompt=_make_assistant_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["ask", "hello", "--format", "csv"],
@@ -784,7 +821,6 @@ class TestAskFormats:
         """Non-console formats should use client.prompt(), not prompt_stream()."""
         mock = _mock_client(prompt=_make_assistant_result())
         mock_cls.return_value = mock
-        app = _import_app()
         runner.invoke(
             app,
             ["ask", "hello", "--format", "json"],
@@ -798,7 +834,6 @@ class TestSearchFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_json(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["search", "test query", "--format", "json"],
@@ -808,10 +843,21 @@ class TestSearchFormats:
         parsed = json.loads(result.output)
         assert parsed["items"][0]["title"] == "Example Result"
 
+    @patch("kagi_client.cli.KagiClient")
+    def test_json_compact(self, mock_cls: Any) -> None:
+        mock_cls.return_value = _mock_client(search=_make_search_result())
+        result = runner.invoke(
+            app,
+            ["search", "test query", "--format", "json", "--compact"],
+            env={"KAGI_SESSION": "fake"},
+        )
+        assert result.exit_code == 0
+        assert result.output.count("\n") == 1
+        assert json.loads(result.output)["items"][0]["title"] == "Example Result"
+
     @patch("kagi_client.cli.KagiClient")
     def test_md(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["search", "test query", "--format", "md"],
@@ -823,7 +869,6 @@ class TestSearchFormats:
     @patch("kagi_client.cli.KagiClient")
     def test_csv(self, mock_cls: Any) -> None:
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["search", "test query", "--format", "csv"],
@@ -840,7 +885,6 @@ class TestSearchFormats:
     def test_short_flag(self, mock_cls: Any) -> None:
         """The -F short flag should work."""
         mock_cls.return_value = _mock_client(search=_make_search_result())
-        app = _import_app()
         result = runner.invoke(
             app,
             ["search", "test query", "-F", "json"],
@@ -12,20 +12,18 @@ from kagi_client.errors import (
 
 
 class TestExceptionHierarchy:
-    def test_kagi_error_is_base(self) -> None:
-        assert issubclass(KagiError, Exception)
-
-    def test_auth_error_inherits_kagi_error(self) -> None:
-        assert issubclass(AuthError, KagiError)
-
-    def test_token_expired_inherits_auth_error(self) -> None:
-        assert issubclass(TokenExpiredError, AuthError)
-
-    def test_stream_parse_error_inherits_kagi_error(self) -> None:
-        assert issubclass(StreamParseError, KagiError)
-
-    def test_api_error_inherits_kagi_error(self) -> None:
-        assert issubclass(APIError, KagiError)
+    @pytest.mark.parametrize(
+        ("child", "parent"),
+        [
+            (KagiError, Exception),
+            (AuthError, KagiError),
+            (TokenExpiredError, AuthError),
+            (StreamParseError, KagiError),
+            (APIError, KagiError),
+        ],
+    )
+    def test_subclass(self, child: type[Exception], parent: type[Exception]) -> None:
+        assert issubclass(child, parent)
 
 
 class TestKagiError:
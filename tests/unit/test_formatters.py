@@ -212,6 +212,11 @@ class TestProofreadJson:
         assert parsed["analysis"] is None
         assert parsed["text"] == "Just plain text."
 
+    def test_compact(self) -> None:
+        result = proofread_json(_proofread_result(), compact=True)
+        assert "\n" not in result
+        assert json.loads(result) == json.loads(proofread_json(_proofread_result()))
+
 
 # -- proofread MD --
 
@@ -365,6 +370,12 @@ class TestAskMd:
         result = ask_md(ar)
         assert "Hello! How can I help?" in result
 
+    def test_plain_text_reply_is_trimmed(self) -> None:
+        ar = _assistant_result_no_thinking()
+        ar.message.md = None
+        ar.message.reply = "  2 + 2 = 4\n"
+        assert ask_md(ar) == "2 + 2 = 4\n"
+
     def test_empty_when_no_content(self) -> None:
         ar = _assistant_result_no_thinking()
         ar.message.md = None
@@ -457,3 +468,16 @@ class TestSearchCsv:
         reader = csv.reader(io.StringIO(result))
         rows = list(reader)
         assert len(rows) == 3  # header + 2 items
+
+    def test_special_characters_match_csv_writer(self) -> None:
+        result = _search_result()
+        result.items[0].title = 'Say "hi", then\nleave'
+        result.items[0].description = ""
+        expected = io.StringIO()
+        writer = csv.writer(expected)
+        writer.writerow(["title", "url", "description", "archive_url", "date"])
+        item = result.items[0]
+        writer.writerow(
+            [item.title, item.url, "", item.web_archive_url or "", item.date or ""]
+        )
+        assert search_csv([result]) == expected.getvalue()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from kagi_client.__main__ import main
+
+
+class TestMain:
+    @pytest.mark.parametrize("flag", ["--version", "-V"])
+    @patch("kagi_client._version.resolve_version", return_value="1.2.4")
+    def test_version_fast_path(
+        self, _mock_version: Any, flag: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        with patch.object(sys, "argv", ["kagi", flag]):
+            main()
+        assert capsys.readouterr().out == "1.2.4\n"
+
+    def test_version_skips_cli_imports(self) -> None:
+        code = (
+            "import sys\n"
+            "from kagi_client.__main__ import main\n"
+            "sys.argv = ['kagi', '--version']\n"
+            "main()\n"
+            "print(sorted({'typer', 'rich', 'httpx'} & set(sys.modules)))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.splitlines()[-1] == "[]"
+
+    @patch("kagi_client.cli.app")
+    def test_other_commands_run_app(self, mock_app: Any) -> None:
+        with patch.object(sys, "argv", ["kagi", "search", "python"]):
+            main()
+        mock_app.assert_called_once_with()
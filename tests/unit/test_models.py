@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import asdict
+
+import pytest
+
 from kagi_client.models import (
     AssistantMessage,
     AssistantResult,
@@ -11,6 +15,7 @@ from kagi_client.models import (
     ProofreadResult,
     ResponseMetadata,
     SearchInfo,
+    SearchItem,
     SearchResult,
     SummaryResult,
     SummaryUpdate,
@@ -276,3 +281,98 @@ class TestSearchModels:
         )
         assert result.info.curr_batch == 1
         assert len(result.domain_infos) == 1
+
+    def test_search_item_has_slots(self) -> None:
+        item = SearchItem(title="T", url="https://a.com", description="D")
+        assert not hasattr(item, "__dict__")
+        with pytest.raises(AttributeError):
+            item.extra = 1  # type: ignore[attr-defined]
+
+
+class TestToDict:
+    def test_proofread_result_matches_asdict(self) -> None:
+        stats = WritingStatistics(
+            word_count=1,
+            character_count=5,
+            character_count_no_spaces=5,
+            paragraph_count=1,
+            sentence_count=1,
+            average_words_per_sentence=1.0,
+            average_characters_per_word=5.0,
+            vocabulary_diversity=1.0,
+            reading_time_minutes=0.1,
+            reading_level="elementary",
+            readability_score=20.0,
+        )
+        result = ProofreadResult(
+            detected_language=DetectedLanguage(iso="en", label="English"),
+            text="hello",
+            analysis=ProofreadAnalysis(
+                corrected_text="hello",
+                changes=[{"from": "helo", "to": "hello"}],
+                corrections_summary="One fix.",
+                tone_analysis=ToneAnalysis(overall_tone="neutral", description="N"),
+                writing_statistics=stats,
+            ),
+        )
+        assert result.to_dict() == asdict(result)
+        empty = ProofreadResult(detected_language=None, text="hi", analysis=None)
+        assert empty.to_dict() == asdict(empty)
+
+    def test_summary_result_matches_asdict(self) -> None:
+        result = SummaryResult(
+            output_text="<p>Title</p>",
+            markdown="Title",
+            status="completed",
+            word_stats=WordStats(
+                n_tokens=100, n_words=80, n_pages=2, time_saved=5, length=None
+            ),
+            response_metadata=ResponseMetadata(
+                speed=None,
+                tokens=4154,
+                total_time_second=12.12,
+                model="Mistral Small",
+                version="mistral-small-latest",
+                cost=0.00048,
+            ),
+            elapsed_seconds=None,
+            title="Test Title",
+        )
+        assert result.to_dict() == asdict(result)
+
+    def test_assistant_result_matches_asdict(self) -> None:
+        result = AssistantResult(
+            thread=AssistantThread(
+                id="abc",
+                title="Test",
+                created_at="2025-09-30T09:47:23Z",
+                expires_at="2025-09-30T10:47:23Z",
+                saved=False,
+                shared=False,
+            ),
+            message=AssistantMessage(
+                id="msg-1",
+                created_at="2025-09-30T09:47:23Z",
+                state="done",
+                prompt="Hello",
+                reply=None,
+                md="Hi",
+            ),
+        )
+        assert result.to_dict() == asdict(result)
+
+    def test_search_result_matches_asdict(self) -> None:
+        result = SearchResult(
+            search_html="<div>results</div>",
+            info=SearchInfo(
+                share_url="https://kagi.com/search?q=test",
+                curr_batch=1,
+                curr_piece=1,
+                next_batch=2,
+                next_piece=1,
+            ),
+            items=[SearchItem(title="T", url="https://a.com", description="D")],
+            domain_infos=[DomainInfo(domain="example.com", favicon_url=None)],
+        )
+        assert result.to_dict() == asdict(result)
+        assert list(result.to_dict()) == list(asdict(result))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from unittest.mock import patch
 
 import httpx
 import pytest
@@ -8,6 +10,7 @@ import respx
 
 from kagi_client.auth import KagiAuth
 from kagi_client.errors import APIError
+from kagi_client.http import create_http_client
 from kagi_client.models import SearchResult
 from kagi_client.search import SearchClient, _parse_search_items
 from tests.conftest import make_jwt_token
@@ -126,6 +129,115 @@ class TestSearchClient:
         assert results[1].info.curr_batch == 2
         assert results[1].info.next_batch == -1
 
+    @respx.mock
+    async def test_search_all_prefetches_pages(self) -> None:
+        def page(request: httpx.Request) -> httpx.Response:
+            batch = int(request.url.params.get("batch", "1"))
+            if batch > 6:
+                return httpx.Response(500, text="past the end")
+            next_batch = batch + 1 if batch < 6 else -1
+            text = SSE_RESPONSE.replace(
+                '"curr_batch":1,"curr_piece":1,"next_batch":2',
+                f'"curr_batch":{batch},"curr_piece":1,"next_batch":{next_batch}',
+            )
+            return httpx.Response(200, text=text)
+
+        route = respx.get(SEARCH_URL).mock(side_effect=page)
+        client = SearchClient(auth=_make_auth())
+        results = [result async for result in client.search_all("test", prefetch=4)]
+        assert [r.info.curr_batch for r in results] == [1, 2, 3, 4, 5, 6]
+        # First page, then batches 2-9 with at most four in flight.
+        assert route.call_count == 9
+
+    @respx.mock
+    async def test_search_all_yields_before_window_completes(self) -> None:
+        release = asyncio.Event()
+
+        async def page(request: httpx.Request) -> httpx.Response:
+            batch = int(request.url.params.get("batch", "1"))
+            if batch == 3:
+                await release.wait()
+            text = SSE_RESPONSE.replace(
+                '"curr_batch":1,"curr_piece":1,"next_batch":2',
+                f'"curr_batch":{batch},"curr_piece":1,"next_batch":'
+                f"{batch + 1 if batch < 3 else -1}",
+            )
+            return httpx.Response(200, text=text)
+
+        respx.get(SEARCH_URL).mock(side_effect=page)
+        client = SearchClient(auth=_make_auth())
+        pages = client.search_all("test")
+        assert (await anext(pages)).info.curr_batch == 1
+        # Batch 2 arrives while batch 3 is still pending.
+        second = await asyncio.wait_for(anext(pages), timeout=1)
+        assert second.info.curr_batch == 2
+        release.set()
+        assert (await anext(pages)).info.curr_batch == 3
+        assert await anext(pages, None) is None
+
+    @respx.mock
+    async def test_search_all_follows_skipped_batch(self) -> None:
+        def page(request: httpx.Request) -> httpx.Response:
+            batch = int(request.url.params.get("batch", "1"))
+            next_batch = {1: 2, 2: 7, 7: -1}.get(batch, -1)
+            text = SSE_RESPONSE.replace(
+                '"curr_batch":1,"curr_piece":1,"next_batch":2',
+                f'"curr_batch":{batch},"curr_piece":1,"next_batch":{next_batch}',
+            )
+            return httpx.Response(200, text=text)
+
+        respx.get(SEARCH_URL).mock(side_effect=page)
+        client = SearchClient(auth=_make_auth())
+        results = [result async for result in client.search_all("test")]
+        assert [r.info.curr_batch for r in results] == [1, 2, 7]
+
+    @respx.mock
+    async def test_search_all_raises_on_needed_page_error(self) -> None:
+        def page(request: httpx.Request) -> httpx.Response:
+            if "batch" in request.url.params:
+                return httpx.Response(429, text="Rate limited")
+            return httpx.Response(200, text=SSE_RESPONSE)
+
+        respx.get(SEARCH_URL).mock(side_effect=page)
+        client = SearchClient(auth=_make_auth())
+        with pytest.raises(APIError):
+            async for _ in client.search_all("test"):
+                pass
+
+    @respx.mock
+    async def test_search_all_borrows_one_client(self) -> None:
+        route = respx.get(SEARCH_URL)
+        route.side_effect = [
+            httpx.Response(200, text=SSE_RESPONSE),
+            httpx.Response(200, text=SSE_RESPONSE_PAGE2),
+        ]
+        client = SearchClient(auth=_make_auth())
+        with patch(
+            "kagi_client.http.create_http_client", wraps=create_http_client
+        ) as create:
+            results = [result async for result in client.search_all("test")]
+        assert len(results) == 2
+        create.assert_called_once_with()
+
+    @respx.mock
+    async def test_context_manager_owns_pooled_client(self) -> None:
+        respx.get(SEARCH_URL).mock(return_value=httpx.Response(200, text=SSE_RESPONSE))
+        async with SearchClient(auth=_make_auth()) as client:
+            http = client._http
+            assert http is not None
+            await client.search("a")
+            await client.search("b")
+            assert client._http is http
+        assert http.is_closed
+        assert client._http is None
+
+    async def test_aclose_leaves_injected_client_open(self) -> None:
+        http = httpx.AsyncClient()
+        async with SearchClient(auth=_make_auth(), http=http) as client:
+            assert client._http is http
+        assert not http.is_closed
+        await http.aclose()
+
 
 RESULT_HTML = (
     '<div class="_0_SRI search-result">'
@@ -180,3 +292,14 @@ class TestParseSearchItems:
 
     def test_no_results_html(self) -> None:
         assert _parse_search_items("<div>no results</div>") == []
+
+    def test_entities_and_nested_tags_in_fields(self) -> None:
+        html = (
+            '<div class="_0_SRI"><a class="__sri_title_link" href="https://a.com">'
+            'Tom &amp; <b title="a>b">Jerry</b></a>'
+            '<div class="__sri-desc"><div>1 &lt; 2 <!-- note --><em>ok</em>'
+            "<![CDATA[hidden]]><!DOCTYPE html></div></div></div>"
+        )
+        (item,) = _parse_search_items(html)
+        assert item.title == "Tom & Jerry"
+        assert item.description == "1 < 2 ok"
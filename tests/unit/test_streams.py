@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 
 from kagi_client.streams import (
     KagiStreamLine,
+    KagiStreamParser,
     SSEEvent,
+    aiter_stream_lines,
+    iter_kagi_stream_lines,
+    iter_sse_events,
     parse_kagi_stream_lines,
     parse_sse_events,
 )
@@ -47,6 +52,13 @@ class TestParseSSEEvents:
         events = parse_sse_events("")
         assert events == []
 
+    def test_unterminated_event_is_dropped(self) -> None:
+        assert parse_sse_events("event: message\ndata: partial") == []
+
+    def test_single_trailing_newline_ends_event(self) -> None:
+        events = parse_sse_events("data: real\n")
+        assert [e.data for e in events] == ["real"]
+
     def test_ignores_comments(self) -> None:
         text = ": comment\ndata: real\n\n"
         events = parse_sse_events(text)
@@ -64,6 +76,25 @@ class TestParseSSEEvents:
         events = parse_sse_events(text)
         assert events[0].id == "CLOSE"
 
+    def test_crlf_line_endings(self) -> None:
+        text = "event: message\r\ndata: hello\r\n\r\ndata: again\r\n\r\n"
+        events = parse_sse_events(text)
+        assert [(e.event, e.data) for e in events] == [
+            ("message", "hello"),
+            (None, "again"),
+        ]
+
+    def test_only_one_leading_space_is_dropped(self) -> None:
+        text = "data:tight\ndata:  indented\n\n"
+        events = parse_sse_events(text)
+        assert events[0].data == "tight\n indented"
+
+    def test_iter_yields_each_event_once_complete(self) -> None:
+        events = iter_sse_events("data: first\n\ndata: second\n\n")
+        assert next(events).data == "first"
+        assert next(events).data == "second"
+        assert next(events, None) is None
+
 
 class TestParseKagiStreamLines:
     def test_basic_kagi_lines(self) -> None:
@@ -129,3 +160,54 @@ class TestParseKagiStreamLines:
         assert lines[0].tag == "thread_list.html"
         assert "thread-list-header" in lines[0].payload
         assert lines[1].tag == "tokens.json"
+
+    def test_colon_in_continuation_is_not_a_tag(self) -> None:
+        text = (
+            "thread_list.html:\n"
+            '<a href="https://kagi.com">x</a>\n'
+            "9lives:not a tag\n"
+            "héllo:not a tag\n"
+        )
+        lines = parse_kagi_stream_lines(text)
+        assert len(lines) == 1
+        assert lines[0].payload == (
+            '<a href="https://kagi.com">x</a>\n9lives:not a tag\nhéllo:not a tag'
+        )
+
+    def test_iter_yields_each_line_once_complete(self) -> None:
+        lines = iter_kagi_stream_lines('hi:{"a":1}\nfinal:<p>\nmore</p>')
+        assert next(lines) == KagiStreamLine(tag="hi", payload='{"a":1}')
+        assert next(lines) == KagiStreamLine(tag="final", payload="<p>\nmore</p>")
+        assert next(lines, None) is None
+
+
+class TestKagiStreamParser:
+    def test_entry_completes_on_next_tag(self) -> None:
+        parser = KagiStreamParser()
+        assert parser.feed("thread_list.html:") is None
+        assert parser.feed("  <div>a</div>") is None
+        line = parser.feed('tokens.json:{"text":"hi"}')
+        assert line == KagiStreamLine(tag="thread_list.html", payload="  <div>a</div>")
+        assert parser.close() == KagiStreamLine(
+            tag="tokens.json", payload='{"text":"hi"}'
+        )
+        assert parser.close() is None
+
+
+async def _chunks(*parts: str) -> AsyncIterator[str]:
+    for part in parts:
+        yield part
+
+
+class TestAiterStreamLines:
+    async def test_splits_on_newline_only(self) -> None:
+        lines = [line async for line in aiter_stream_lines(_chunks("a\u2028b\r\nc\n"))]
+        assert lines == ["a\u2028b\r", "c"]
+
+    async def test_joins_line_split_across_many_chunks(self) -> None:
+        # One long line arriving a character at a time is collected as
+        # fragments and joined once, not re-concatenated per chunk.
+        payload = "x" * 10_000
+        chunks = _chunks("update:", *payload, "\n", "final:{}")
+        lines = [line async for line in aiter_stream_lines(chunks)]
+        assert lines == [f"update:{payload}", "final:{}"]
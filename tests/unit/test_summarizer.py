@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
 
 import httpx
 import pytest
@@ -97,3 +99,156 @@ class TestSummarizerClient:
         # 2 updates + 1 final
         assert len(updates) == 3
         assert updates[-1].type == "final"
+
+    @respx.mock
+    async def test_summarize_stream_yields_before_body_ends(self) -> None:
+        release = asyncio.Event()
+        lines = KAGI_STREAM_RESPONSE.encode().splitlines(keepends=True)
+
+        async def body() -> AsyncIterator[bytes]:
+            yield lines[0] + lines[1]
+            await release.wait()
+            yield lines[2]
+
+        respx.get(SUMMARIZER_URL).mock(return_value=httpx.Response(200, content=body()))
+        client = SummarizerClient(auth=_make_auth())
+        updates = client.summarize_stream("https://example.com/article")
+        first = await asyncio.wait_for(anext(updates), timeout=1)
+        assert first.status == "reading"
+        release.set()
+        rest = [update async for update in updates]
+        assert [u.type for u in rest] == ["update", "final"]
+
+    @respx.mock
+    async def test_summarize_keeps_line_separator_in_payload(self) -> None:
+        text = KAGI_STREAM_RESPONSE.replace("Point one", "Point\u2028one")
+        respx.get(SUMMARIZER_URL).mock(return_value=httpx.Response(200, text=text))
+        client = SummarizerClient(auth=_make_auth())
+        result = await client.summarize("https://example.com/article")
+        assert result.markdown == "Title: Test\n\n- Point\u2028one"
+
+    @respx.mock
+    async def test_summarize_raises_on_empty_stream(self) -> None:
+        respx.get(SUMMARIZER_URL).mock(return_value=httpx.Response(200, text=""))
+        client = SummarizerClient(auth=_make_auth())
+        with pytest.raises(APIError, match="No summary"):
+            await client.summarize("https://example.com/article")
+
+    @respx.mock
+    async def test_summarize_ignores_lines_after_final(self) -> None:
+        text = KAGI_STREAM_RESPONSE + "update:not json\n"
+        respx.get(SUMMARIZER_URL).mock(return_value=httpx.Response(200, text=text))
+        client = SummarizerClient(auth=_make_auth())
+        result = await client.summarize("https://example.com/article")
+        assert result.title == "Test Article"
+
+    @respx.mock
+    async def test_summarize_skips_decoding_intermediate_updates(self) -> None:
+        text = "update:not json\n" + KAGI_STREAM_RESPONSE
+        respx.get(SUMMARIZER_URL).mock(return_value=httpx.Response(200, text=text))
+        client = SummarizerClient(auth=_make_auth())
+        result = await client.summarize("https://example.com/article")
+        assert result.title == "Test Article"
+
+    @respx.mock
+    async def test_summarize_caches_result(self) -> None:
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        client = SummarizerClient(auth=_make_auth())
+        first = await client.summarize("https://example.com/article")
+        second = await client.summarize("https://example.com/article")
+        assert second == first
+        assert route.call_count == 1
+        await client.summarize("https://example.com/article", summary_type="summary")
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_summarize_coalesces_concurrent_calls(self) -> None:
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        client = SummarizerClient(auth=_make_auth())
+        results = await asyncio.gather(
+            *(client.summarize("https://example.com/article") for _ in range(3))
+        )
+        assert route.call_count == 1
+        assert results[0] == results[1] == results[2]
+
+    @respx.mock
+    async def test_summarize_returns_independent_copies(self) -> None:
+        respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        client = SummarizerClient(auth=_make_auth())
+        first = await client.summarize("https://example.com/article")
+        first.title = "changed"
+        first.word_stats.n_words = 0
+        second = await client.summarize("https://example.com/article")
+        assert second.title == "Test Article"
+        assert second.word_stats.n_words == 80
+
+    @respx.mock
+    async def test_summarize_cache_entry_expires(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        now = 1000.0
+        monkeypatch.setattr("kagi_client.summarizer.time.monotonic", lambda: now)
+        client = SummarizerClient(auth=_make_auth(), cache_ttl=60.0)
+        await client.summarize("https://example.com/article")
+        now += 59.0
+        await client.summarize("https://example.com/article")
+        assert route.call_count == 1
+        now += 1.0
+        await client.summarize("https://example.com/article")
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_summarize_cancelled_caller_does_not_cancel_others(self) -> None:
+        release = asyncio.Event()
+
+        async def body() -> AsyncIterator[bytes]:
+            await release.wait()
+            yield KAGI_STREAM_RESPONSE.encode()
+
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, content=body())
+        )
+        client = SummarizerClient(auth=_make_auth())
+        cancelled = asyncio.create_task(client.summarize("https://example.com/article"))
+        waiting = asyncio.create_task(client.summarize("https://example.com/article"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        result = await waiting
+        assert result.title == "Test Article"
+        assert cancelled.cancelled()
+        assert route.call_count == 1
+
+    @respx.mock
+    async def test_summarize_does_not_cache_errors(self) -> None:
+        route = respx.get(SUMMARIZER_URL).mock(
+            side_effect=[
+                httpx.Response(500, text="oops"),
+                httpx.Response(200, text=KAGI_STREAM_RESPONSE),
+            ]
+        )
+        client = SummarizerClient(auth=_make_auth())
+        with pytest.raises(APIError):
+            await client.summarize("https://example.com/article")
+        result = await client.summarize("https://example.com/article")
+        assert result.title == "Test Article"
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_summarize_cache_disabled(self) -> None:
+        route = respx.get(SUMMARIZER_URL).mock(
+            return_value=httpx.Response(200, text=KAGI_STREAM_RESPONSE)
+        )
+        client = SummarizerClient(auth=_make_auth(), cache_size=0)
+        await client.summarize("https://example.com/article")
+        await client.summarize("https://example.com/article")
+        assert route.call_count == 2